@@ -0,0 +1,67 @@
+"""Micro-benchmark for JSON data extraction.
+
+Compares the per-call cost of compiling jq expressions and tokenizing JSON
+paths on every call against reusing a precompiled Extractor.
+
+Usage, from the repository root:
+    python -m benchmarks.json_extraction [iterations]
+"""
+
+import sys
+import timeit
+
+import jq
+
+from grydgets.json_utils import Extractor
+
+DATA = {
+    "events": [
+        {"title": f"Event {i}", "active": i % 2 == 0, "temperature": 20 + i}
+        for i in range(50)
+    ]
+}
+
+CASES = [
+    ("json_path", "events[3].title", None),
+    ("jq", None, '.events | map(select(.active)) | .[0].title'),
+    ("json_path + jq", "events", "map(.temperature) | add"),
+]
+
+
+def extract_uncached(data, json_path=None, jq_expression=None):
+    """Extraction as it worked before expressions were cached."""
+    if json_path:
+        json_path_list = list()
+        for segment in json_path.replace("]", "").split("."):
+            sub_segments = segment.split("[")
+            json_path_list.append(sub_segments[0])
+            if len(sub_segments) > 1:
+                json_path_list += [int(array_index) for array_index in sub_segments[1:]]
+        while json_path_list:
+            data = data[json_path_list.pop(0)]
+    if jq_expression:
+        data = jq.compile(jq_expression).input_value(data).first()
+    return data
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{'case':<16} {'uncached (us)':>14} {'compiled (us)':>14} {'speedup':>8}")
+    for name, json_path, jq_expression in CASES:
+        extractor = Extractor(json_path=json_path, jq_expression=jq_expression)
+        assert extractor.extract(DATA) == extract_uncached(DATA, json_path, jq_expression)
+
+        uncached = timeit.timeit(
+            lambda: extract_uncached(DATA, json_path, jq_expression), number=iterations
+        )
+        compiled = timeit.timeit(lambda: extractor.extract(DATA), number=iterations)
+
+        print(
+            f"{name:<16} {uncached / iterations * 1e6:>14.1f} "
+            f"{compiled / iterations * 1e6:>14.1f} {uncached / compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""Offline render benchmark driven by a widgets.yaml layout.
+
+Builds the widget tree exactly like the dashboard does, under the SDL dummy
+video driver, feeds providers with recorded payloads instead of starting
+them, and renders frames as fast as possible under scripted scenarios.
+Widgets run offline: those that fetch their own data are built without
+fetching or starting their update threads, and nothing fetches images or
+renders templates over the network while frames are timed.
+"""
+
+import json
+import logging
+import os
+import time
+import tracemalloc
+
+from grydgets import config
+from grydgets.profiler import percentile, profiler
+
+SCENARIOS = ("idle", "value", "flip", "notify")
+
+# Frames rendered before measuring, to fill caches and lay out grids
+WARMUP_FRAMES = 3
+# The notify scenario sends this many notifications to every notifiable
+# widget, every NOTIFICATION_BURST_EVERY frames
+NOTIFICATION_BURST_SIZE = 5
+NOTIFICATION_BURST_EVERY = 50
+# Number of widgets listed by self render time in each scenario's report
+SLOWEST_WIDGETS = 5
+
+
+def load_payloads(path):
+    """Load recorded provider payloads.
+
+    The file is either a provider recording (.jsonl or .jsonl.gz), or a
+    YAML/JSON file mapping provider names to a list of payloads, which are
+    played back in order.
+
+    Returns:
+        Dict mapping provider name to a list of payloads.
+    """
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        from grydgets.providers.recording import load_recording
+
+        return {
+            name: [data for _, data in entries]
+            for name, entries in load_recording(path).items()
+        }
+
+    payloads = config.load_yaml(path) or {}
+    if not isinstance(payloads, dict):
+        raise ValueError(f"{path} must map provider names to lists of payloads")
+    return {
+        name: value if isinstance(value, list) else [value]
+        for name, value in payloads.items()
+    }
+
+
+def walk(widget):
+    """Yield widget and all of its descendants."""
+    yield widget
+    for child in getattr(widget, "widget_list", ()):
+        yield from walk(child)
+
+
+class Bench:
+    """Builds a fresh widget tree per scenario and times its frames."""
+
+    def __init__(self, widget_tree, providers_path, payloads, screen_size, value_provider=None):
+        self.widget_tree = widget_tree
+        self.providers_path = providers_path
+        self.payloads = payloads
+        self.screen_size = screen_size
+        self.value_provider = value_provider
+
+    def build(self):
+        from grydgets.providers import ProviderManager
+        from grydgets.widgets.containers import ScreenWidget
+        from grydgets.widgets.widgets import WidgetManager
+
+        profiler.reset()
+
+        # Providers are never started: they only serve recorded payloads
+        provider_manager = ProviderManager(self.providers_path, record=False)
+        for name, payloads in self.payloads.items():
+            if provider_manager.has_provider(name) and payloads:
+                provider_manager.get_provider(name).set_data(payloads[0])
+
+        widget_manager = WidgetManager(provider_manager)
+        screen_widget = ScreenWidget(
+            self.screen_size,
+            image_path=self.widget_tree.get("background_image", None),
+            color=self.widget_tree.get("background_color", (0, 0, 0)),
+            drop_shadow=self.widget_tree.get("drop_shadow", False),
+        )
+        screen_widget.add_widget(
+            widget_manager.create_widget_tree(self.widget_tree["widgets"][0])
+        )
+        return provider_manager, widget_manager, screen_widget
+
+    def pick_value_provider(self, provider_manager):
+        if self.value_provider is not None:
+            return provider_manager.get_provider(self.value_provider)
+        candidates = [
+            name
+            for name, payloads in self.payloads.items()
+            if provider_manager.has_provider(name)
+        ]
+        candidates.sort(key=lambda name: len(self.payloads[name]) < 2)
+        if candidates:
+            return provider_manager.get_provider(candidates[0])
+        return None
+
+    def make_step(self, scenario, provider_manager, widget_manager, screen_widget):
+        """Return a function run before each frame to script the scenario."""
+        if scenario == "idle":
+            return lambda frame: None
+
+        if scenario == "value":
+            provider = self.pick_value_provider(provider_manager)
+            if provider is None:
+                return None
+            payloads = self.payloads.get(provider.name) or [provider.get_data()]
+
+            def step(frame):
+                provider.set_data(payloads[frame % len(payloads)])
+
+            return step
+
+        if scenario == "flip":
+            from grydgets.widgets.containers import FlipWidget
+
+            flips = [
+                widget
+                for widget in walk(screen_widget)
+                if isinstance(widget, FlipWidget) and len(widget.widget_list) > 1
+            ]
+            if not flips:
+                return None
+
+            def step(frame):
+                for flip in flips:
+                    if not flip.moving and flip.current_widget is not None:
+                        flip.start_transition(
+                            (flip.current_widget + 1) % len(flip.widget_list)
+                        )
+
+            return step
+
+        if scenario == "notify":
+            targets = list(widget_manager.name_to_instance.values())
+            if not targets:
+                return None
+
+            def step(frame):
+                if frame % NOTIFICATION_BURST_EVERY:
+                    return
+                for target in targets:
+                    for index in range(NOTIFICATION_BURST_SIZE):
+                        target.notify(
+                            {"text": f"Notification {frame}.{index}", "duration": 0}
+                        )
+
+            return step
+
+        raise ValueError(f"Unknown scenario '{scenario}'")
+
+    def run_frames(self, screen_widget, step, frames, trace_allocations=False):
+        frame_times = []
+        rendered = 0
+        frame_peaks = []
+        if trace_allocations:
+            start_memory = tracemalloc.get_traced_memory()[0]
+        for frame in range(frames):
+            if trace_allocations:
+                tracemalloc.reset_peak()
+                frame_start_memory = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            step(frame)
+            screen_widget.tick()
+            if screen_widget.is_dirty():
+                screen_widget.render(self.screen_size)
+                profiler.frame()
+                rendered += 1
+            frame_times.append(time.perf_counter() - start)
+            if trace_allocations:
+                frame_peaks.append(tracemalloc.get_traced_memory()[1] - frame_start_memory)
+        result = {"frame_times": frame_times, "rendered": rendered}
+        if trace_allocations:
+            result["frame_peaks"] = frame_peaks
+            result["retained"] = tracemalloc.get_traced_memory()[0] - start_memory
+        return result
+
+    def run(self, scenario, frames, allocation_frames):
+        """Run one scenario and return its report, or None if it doesn't apply."""
+        from grydgets.widgets.base import Widget
+
+        # Live requests would add network time and noise to the timings
+        Widget.offline = True
+        try:
+            return self._run(scenario, frames, allocation_frames)
+        finally:
+            Widget.offline = False
+
+    def _run(self, scenario, frames, allocation_frames):
+        from grydgets.widgets.base import UpdaterWidget
+        from grydgets.widgets.provider_widgets import (
+            ProviderImageWidget,
+            ProviderTemplateWidget,
+        )
+
+        provider_manager, widget_manager, screen_widget = self.build()
+        offline_widgets = [
+            widget.unique_name
+            for widget in walk(screen_widget)
+            if isinstance(
+                widget, (UpdaterWidget, ProviderImageWidget, ProviderTemplateWidget)
+            )
+        ]
+        try:
+            step = self.make_step(scenario, provider_manager, widget_manager, screen_widget)
+            if step is None:
+                return None
+
+            self.run_frames(screen_widget, step, WARMUP_FRAMES)
+            start = time.perf_counter()
+            timed = self.run_frames(screen_widget, step, frames)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            try:
+                traced = self.run_frames(
+                    screen_widget, step, allocation_frames, trace_allocations=True
+                )
+            finally:
+                tracemalloc.stop()
+        finally:
+            widget_manager.stop_all_widgets(screen_widget)
+
+        frame_times = sorted(timed["frame_times"])
+        frame_peaks = traced["frame_peaks"] or [0]
+        widget_stats = profiler.get_stats()["widgets"]
+        slowest = sorted(
+            widget_stats,
+            key=lambda name: widget_stats[name]["render_ms"]["self_total"],
+            reverse=True,
+        )[:SLOWEST_WIDGETS]
+        return {
+            "frames": frames,
+            "rendered": timed["rendered"],
+            "fps": round(frames / elapsed, 1) if elapsed else None,
+            "frame_ms": {
+                "mean": round(sum(frame_times) / len(frame_times) * 1000, 3),
+                "p50": round(percentile(frame_times, 0.5) * 1000, 3),
+                "p95": round(percentile(frame_times, 0.95) * 1000, 3),
+                "p99": round(percentile(frame_times, 0.99) * 1000, 3),
+                "max": round(frame_times[-1] * 1000, 3),
+            },
+            "allocations_kb": {
+                "mean_peak_per_frame": round(sum(frame_peaks) / len(frame_peaks) / 1024, 1),
+                "max_peak_per_frame": round(max(frame_peaks) / 1024, 1),
+                "retained": round(traced["retained"] / 1024, 1),
+            },
+            "slowest_widgets": {
+                name: widget_stats[name]["render_ms"]["self_total"] for name in slowest
+            },
+            "offline_widgets": offline_widgets,
+        }
+
+
+def format_report(results):
+    header = (
+        f"{'scenario':<10}{'frames':>8}{'rendered':>10}{'fps':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'alloc KB':>10}{'kept KB':>9}"
+    )
+    lines = [header]
+    for scenario, result in results.items():
+        if result is None:
+            lines.append(f"{scenario:<10}  skipped (nothing in the layout to drive it)")
+            continue
+        frame_ms = result["frame_ms"]
+        allocations = result["allocations_kb"]
+        lines.append(
+            f"{scenario:<10}{result['frames']:>8}{result['rendered']:>10}"
+            f"{result['fps']:>10}{frame_ms['p50']:>9}{frame_ms['p95']:>9}"
+            f"{frame_ms['p99']:>9}{frame_ms['max']:>9}"
+            f"{allocations['mean_peak_per_frame']:>10}{allocations['retained']:>9}"
+        )
+        slowest = ", ".join(
+            f"{name} {self_ms} ms" for name, self_ms in result["slowest_widgets"].items()
+        )
+        lines.append(f"{'':<10}slowest (self render time): {slowest}")
+        if result["offline_widgets"]:
+            offline = ", ".join(result["offline_widgets"])
+            lines.append(f"{'':<10}offline (make their own requests): {offline}")
+    return "\n".join(lines)
+
+
+def run_bench(args):
+    """Entry point for `grydgets bench`."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+
+    logging.getLogger().setLevel(logging.WARNING)
+    pygame.init()
+
+    widget_tree = config.load_yaml(args.widgets)
+    if args.resolution:
+        screen_size = tuple(int(axis) for axis in args.resolution.lower().split("x"))
+    elif os.path.exists("conf.yaml"):
+        screen_size = tuple(config.load_config("conf.yaml")["graphics"]["resolution"])
+    else:
+        screen_size = (480, 320)
+
+    payloads = load_payloads(args.payloads) if args.payloads else {}
+    bench = Bench(
+        widget_tree,
+        args.providers,
+        payloads,
+        screen_size,
+        value_provider=args.provider,
+    )
+
+    results = {}
+    for scenario in args.scenario or SCENARIOS:
+        results[scenario] = bench.run(scenario, args.frames, args.allocation_frames)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results))
+
+    pygame.quit()
@@ -8,32 +8,99 @@ import time
 import threading
 from flask import Flask, request, jsonify
 
-from grydgets import config
+from grydgets import bench, config
+from grydgets.fonts import font_cache, text_cache
+from grydgets.http_client import http_client
 from grydgets.outputs import create_outputs
+from grydgets.profiler import profiler
 from grydgets.widgets import image as image_module
 from grydgets.widgets.containers import ScreenWidget
 from grydgets.widgets.widgets import WidgetManager
 from grydgets.providers import ProviderManager
+from grydgets.scheduler import earliest, scheduler
+
+# Longest the main loop sleeps when nothing has declared a deadline
+MAX_IDLE_SLEEP = 60
+# How often pending input events are checked while a display is attached
+EVENT_POLL_INTERVAL = 0.25
 
 logging.basicConfig(
     format="[%(asctime)s] %(levelname)s:%(name)s:%(message)s", level=logging.DEBUG
 )
 
 
-def parse_args():
-    parser = argparse.ArgumentParser(description="Grydgets dashboard")
+def add_common_arguments(parser, suppress_defaults=False):
+    # Subcommands accept the same options, without overriding values given
+    # before the subcommand name
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+
     parser.add_argument(
         "--widgets",
-        default="widgets.yaml",
+        default=default("widgets.yaml"),
         metavar="FILE",
         help="Widget configuration file (default: widgets.yaml)",
     )
     parser.add_argument(
         "--config-dir",
-        default=None,
+        default=default(None),
         metavar="DIR",
         help="Directory containing config files, fonts, and images (default: current directory)",
     )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Grydgets dashboard")
+    add_common_arguments(parser)
+
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Render the widget layout offline and report frame timings",
+    )
+    add_common_arguments(bench_parser, suppress_defaults=True)
+    bench_parser.add_argument(
+        "--providers",
+        default="providers.yaml",
+        metavar="FILE",
+        help="Provider configuration file (default: providers.yaml)",
+    )
+    bench_parser.add_argument(
+        "--payloads",
+        default=None,
+        metavar="FILE",
+        help="Recorded provider payloads to feed the providers with",
+    )
+    bench_parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=bench.SCENARIOS,
+        help="Scenario to run; can be repeated (default: all)",
+    )
+    bench_parser.add_argument(
+        "--provider",
+        default=None,
+        metavar="NAME",
+        help="Provider whose payloads change in the 'value' scenario",
+    )
+    bench_parser.add_argument(
+        "--frames", type=int, default=300, help="Frames per scenario (default: 300)"
+    )
+    bench_parser.add_argument(
+        "--allocation-frames",
+        type=int,
+        default=50,
+        help="Frames traced for allocations per scenario (default: 50)",
+    )
+    bench_parser.add_argument(
+        "--resolution",
+        default=None,
+        metavar="WxH",
+        help="Screen size (default: from conf.yaml, or 480x320)",
+    )
+    bench_parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON"
+    )
     return parser.parse_args()
 
 
@@ -43,6 +110,10 @@ def main():
     if args.config_dir is not None:
         os.chdir(args.config_dir)
 
+    if args.command == "bench":
+        bench.run_bench(args)
+        return
+
     def load_widget_tree():
         return config.load_yaml(args.widgets)
 
@@ -56,6 +127,8 @@ def main():
 
     logging.getLogger().setLevel(logging.getLevelName(conf["logging"]["level"].upper()))
 
+    http_client.configure(**conf.get("http", {}))
+
     # Create outputs
     outputs = create_outputs(conf["outputs"], render_config)
     any_needs_display = any(o.needs_display for o in outputs)
@@ -84,13 +157,19 @@ def main():
 
     widget_manager = WidgetManager(provider_manager)
 
-    screen_widget = ScreenWidget(
-        screen_size,
-        image_path=widget_tree.get("background_image", None),
-        color=widget_tree.get("background_color", (0, 0, 0)),
-        drop_shadow=widget_tree.get("drop_shadow", False),
-    )
+    def create_screen_widget(tree):
+        return ScreenWidget(
+            screen_size,
+            image_path=tree.get("background_image", None),
+            color=tree.get("background_color", (0, 0, 0)),
+            drop_shadow=tree.get("drop_shadow", False),
+        )
+
+    def screen_options(tree):
+        return {key: value for key, value in tree.items() if key != "widgets"}
 
+    screen_widget = create_screen_widget(widget_tree)
+    profiler.attach(screen_widget)
     screen_widget.add_widget(widget_manager.create_widget_tree(widget_tree["widgets"][0]))
 
     # Flask app for notifications
@@ -106,6 +185,26 @@ def main():
         widget_manager.name_to_instance[requested_widget].notify(payload)
         return jsonify({"success": True})
 
+    @app.route("/stats/http", methods=["GET"])
+    def http_stats():
+        return jsonify(http_client.get_stats())
+
+    @app.route("/stats/fonts", methods=["GET"])
+    def font_stats():
+        return jsonify(font_cache.get_stats())
+
+    @app.route("/stats/text", methods=["GET"])
+    def text_stats():
+        return jsonify(text_cache.get_stats())
+
+    @app.route("/stats/images", methods=["GET"])
+    def image_stats():
+        return jsonify(image_module.image_cache.get_stats())
+
+    @app.route("/stats/render", methods=["GET"])
+    def render_stats():
+        return jsonify(profiler.get_stats())
+
     def run_server():
         app.run(host="0.0.0.0", port=conf["server"]["port"])
 
@@ -122,50 +221,80 @@ def main():
                 new_conf = config.load_config("conf.yaml")
                 new_conf = config.migrate_config(new_conf)
 
-                # Check if display requirements changed (requires restart)
-                new_outputs = create_outputs(new_conf["outputs"], new_conf["graphics"])
-                new_needs_display = any(o.needs_display for o in new_outputs)
-                if new_needs_display != any_needs_display:
-                    logging.warning(
-                        "Display mode changed. This requires a restart. "
-                        "Ignoring configuration reload."
-                    )
-                    return
-
-                # Stop old outputs
-                for output in outputs:
-                    output.stop()
-
-                # Setup new outputs
-                outputs = new_outputs
-                for output in outputs:
-                    output.setup(screen_size)
-                fps_limit = max(o.preferred_fps for o in outputs)
-                any_needs_display = new_needs_display
-                last_surface = None
+                new_outputs = None
+                if (
+                    new_conf["outputs"] != conf["outputs"]
+                    or new_conf["graphics"] != conf["graphics"]
+                ):
+                    # Check if display requirements changed (requires restart)
+                    new_outputs = create_outputs(new_conf["outputs"], new_conf["graphics"])
+                    new_needs_display = any(o.needs_display for o in new_outputs)
+                    if new_needs_display != any_needs_display:
+                        logging.warning(
+                            "Display mode changed. This requires a restart. "
+                            "Ignoring configuration reload."
+                        )
+                        return
 
                 new_widget_tree = load_widget_tree()
-                logging.info("Stopping all widgets...")
-                widget_manager.stop_all_widgets(screen_widget)
 
-                logging.info("Stopping all providers...")
-                provider_manager.stop_all()
+                # Build everything that changed on the side, reusing what
+                # didn't; the running providers and widgets are only
+                # replaced once all of it was created successfully
+                logging.info("Preparing providers...")
+                new_provider_manager = ProviderManager(
+                    'providers.yaml', previous=provider_manager
+                )
+                try:
+                    logging.info("Preparing widgets...")
+                    new_screen_widget = None
+                    if screen_options(new_widget_tree) != screen_options(widget_tree):
+                        new_screen_widget = create_screen_widget(new_widget_tree)
+                    new_widget_manager = WidgetManager(new_provider_manager)
+                    update = new_widget_manager.update_widget_tree(
+                        screen_widget.widget_list[0],
+                        widget_tree["widgets"][0],
+                        new_widget_tree["widgets"][0],
+                        new_provider_manager.changed,
+                    )
+                except Exception:
+                    new_provider_manager.discard()
+                    raise
 
-                logging.info("Starting new providers...")
-                provider_manager = ProviderManager('providers.yaml')
-                provider_manager.start_all()
+                if new_provider_manager.changed:
+                    logging.info(
+                        f"Replacing providers: {sorted(new_provider_manager.changed)}"
+                    )
+                update.apply()
+                if new_screen_widget is not None:
+                    profiler.detach(screen_widget)
+                    profiler.attach(new_screen_widget)
+                    new_screen_widget.add_widget(update.root)
+                    screen_widget = new_screen_widget
+                elif update.root is not screen_widget.widget_list[0]:
+                    screen_widget.replace_widget(0, update.root)
+                widget_manager = new_widget_manager
+                new_provider_manager.take_over()
+                provider_manager = new_provider_manager
+
+                http_client.configure(**new_conf.get("http", {}))
+
+                if new_outputs is not None:
+                    # Stop old outputs
+                    for output in outputs:
+                        output.stop()
 
-                widget_manager = WidgetManager(provider_manager)
+                    # Setup new outputs
+                    outputs = new_outputs
+                    for output in outputs:
+                        output.setup(screen_size)
+                    fps_limit = max(o.preferred_fps for o in outputs)
+                    any_needs_display = new_needs_display
+                    last_surface = None
 
-                screen_widget = ScreenWidget(
-                    screen_size,
-                    image_path=new_widget_tree.get("background_image", None),
-                    color=new_widget_tree.get("background_color", (0, 0, 0)),
-                    drop_shadow=new_widget_tree.get("drop_shadow", False),
-                )
-                screen_widget.add_widget(widget_manager.create_widget_tree(new_widget_tree["widgets"][0]))
                 widget_tree = new_widget_tree
                 conf = new_conf
+                scheduler.wake()
                 logging.info("Configuration reloaded successfully.")
             except Exception as e:
                 logging.error(f"Failed to reload configuration: {e}")
@@ -178,6 +307,9 @@ def main():
     while not stop_everything.is_set():
         frame_start = time.time()
         try:
+            # Anything that changes from now on must wake up the next wait
+            scheduler.clear()
+
             if any_needs_display:
                 for event in pygame.event.get():
                     if event.type in [pygame.QUIT, pygame.MOUSEBUTTONDOWN]:
@@ -190,25 +322,55 @@ def main():
                 is_dirty = screen_widget.is_dirty()
 
                 if ready_outputs and (is_dirty or last_surface is None):
+                    first_frame = last_surface is None
                     if render_config.get("flip", False):
                         last_surface = rotate(screen_widget.render(screen_size), 180)
+                        damage = [
+                            pygame.Rect(
+                                screen_size[0] - rect.right,
+                                screen_size[1] - rect.bottom,
+                                rect.width,
+                                rect.height,
+                            )
+                            for rect in screen_widget.get_damage()
+                        ]
                     else:
                         last_surface = screen_widget.render(screen_size)
+                        damage = screen_widget.get_damage()
+                    if first_frame:
+                        damage = None
                     freshly_rendered = True
+                    profiler.frame()
                 else:
                     freshly_rendered = False
+                    damage = []
 
                 if last_surface is not None:
                     ready_set = set(id(o) for o in ready_outputs)
                     for output in outputs:
                         if id(output) in ready_set:
-                            output.on_frame(last_surface, freshly_rendered or output._pending_dirty)
+                            if output._pending_dirty:
+                                output.on_frame(last_surface, True)
+                            else:
+                                output.on_frame(last_surface, freshly_rendered, damage)
                             output._pending_dirty = False
                         elif freshly_rendered:
                             output._pending_dirty = True
 
-            sleep_time = max((1 / fps_limit) - (time.time() - frame_start), 0)
-            time.sleep(sleep_time)
+                deadline = earliest(
+                    screen_widget.next_deadline(),
+                    *(output.next_deadline() for output in outputs),
+                )
+
+            # Sleep until the earliest deadline or until a provider, updater
+            # thread or notification wakes us up, but never render faster
+            # than fps_limit
+            min_frame_end = frame_start + 1 / fps_limit
+            wake_time = deadline if deadline is not None else frame_start + MAX_IDLE_SLEEP
+            if any_needs_display:
+                wake_time = min(wake_time, frame_start + EVENT_POLL_INTERVAL)
+            scheduler.wait_until(max(wake_time, min_frame_end))
+            time.sleep(max(min_frame_end - time.time(), 0))
         except KeyboardInterrupt:
             stop_everything.set()
 
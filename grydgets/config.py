@@ -129,6 +129,18 @@ config_schema = voluptuous.Schema(
                 int, voluptuous.Range(1, 655355)
             )
         },
+        voluptuous.Optional("http"): {
+            voluptuous.Optional("pool_size", default=10): voluptuous.All(
+                int, voluptuous.Range(min=1)
+            ),
+            voluptuous.Optional("keep_alive", default=True): bool,
+            voluptuous.Optional("timeout", default=30): voluptuous.All(
+                voluptuous.Any(int, float), voluptuous.Range(min=0, min_included=False)
+            ),
+            voluptuous.Optional("coalesce_window", default=1): voluptuous.All(
+                voluptuous.Any(int, float), voluptuous.Range(min=0)
+            ),
+        },
         # Legacy headless config (still accepted, migrated to file output)
         voluptuous.Optional("headless"): {
             voluptuous.Required("enabled", default=False): bool,
@@ -205,30 +217,203 @@ provider_auth_schema = voluptuous.Schema(
     )
 )
 
+# Options shared by all provider types
+provider_common_schema = {
+    voluptuous.Optional("update_interval", default=60): voluptuous.All(
+        int, voluptuous.Range(min=1)
+    ),
+    voluptuous.Optional("jitter", default=0): voluptuous.All(
+        int, voluptuous.Range(min=0)
+    ),
+    voluptuous.Optional("backoff_factor", default=2): voluptuous.All(
+        voluptuous.Any(int, float), voluptuous.Range(min=1)
+    ),
+    voluptuous.Optional("max_backoff", default=300): voluptuous.All(
+        voluptuous.Any(int, float), voluptuous.Range(min=0, min_included=False)
+    ),
+    voluptuous.Optional("failure_threshold", default=3): voluptuous.All(
+        int, voluptuous.Range(min=1)
+    ),
+    voluptuous.Optional("stale_ttl", default=0): voluptuous.All(
+        voluptuous.Any(int, float), voluptuous.Range(min=0)
+    ),
+    voluptuous.Optional("history"): {
+        voluptuous.Optional("json_path"): str,
+        voluptuous.Optional("jq_expression"): str,
+        voluptuous.Optional("size", default=1440): voluptuous.All(
+            int, voluptuous.Range(min=2)
+        ),
+        voluptuous.Optional("resolution", default=60): voluptuous.All(
+            voluptuous.Any(int, float), voluptuous.Range(min=0, min_included=False)
+        ),
+        voluptuous.Optional("file"): str,
+    },
+}
+
+rest_provider_schema = {
+    **provider_common_schema,
+    voluptuous.Required("type"): "rest",
+    voluptuous.Required("url"): str,
+    voluptuous.Optional("method", default="GET"): voluptuous.In(
+        ["GET", "POST", "PUT", "DELETE"]
+    ),
+    voluptuous.Optional("headers"): dict,
+    voluptuous.Optional("params"): dict,
+    voluptuous.Optional("body"): voluptuous.Any(dict, str),
+    voluptuous.Optional("payload"): voluptuous.Any(dict, str),
+    voluptuous.Optional("auth"): provider_auth_schema,
+    voluptuous.Optional("json_path"): str,
+    voluptuous.Optional("jq_expression"): str,
+}
+
+replay_provider_schema = {
+    **provider_common_schema,
+    voluptuous.Required("type"): "replay",
+    voluptuous.Required("file"): str,
+    voluptuous.Optional("source"): str,
+    voluptuous.Optional("speed", default=1): voluptuous.All(
+        voluptuous.Coerce(float), voluptuous.Range(min=0, min_included=False)
+    ),
+    voluptuous.Optional("loop", default=True): bool,
+}
+
+# Push providers reconnect after update_interval seconds instead of polling
+stream_provider_schema = {
+    **{
+        key: value
+        for key, value in provider_common_schema.items()
+        if key != "update_interval"
+    },
+    voluptuous.Optional("update_interval", default=5): voluptuous.All(
+        int, voluptuous.Range(min=1)
+    ),
+    voluptuous.Required("url"): str,
+    voluptuous.Optional("headers"): dict,
+    voluptuous.Optional("auth"): provider_auth_schema,
+    voluptuous.Optional("json_path"): str,
+    voluptuous.Optional("jq_expression"): str,
+    voluptuous.Optional("update", default="replace"): voluptuous.In(
+        ["replace", "merge", "keyed"]
+    ),
+    voluptuous.Optional("key"): str,
+    voluptuous.Optional("idle_timeout", default=300): voluptuous.All(
+        voluptuous.Any(int, float), voluptuous.Range(min=0)
+    ),
+}
+
+sse_provider_schema = {
+    **stream_provider_schema,
+    voluptuous.Required("type"): "sse",
+    voluptuous.Optional("params"): dict,
+    voluptuous.Optional("events"): voluptuous.Any(str, [str]),
+}
+
+websocket_provider_schema = {
+    **stream_provider_schema,
+    voluptuous.Required("type"): "websocket",
+    voluptuous.Optional("send"): [voluptuous.Any(dict, list, str)],
+}
+
+mqtt_provider_schema = {
+    **{
+        key: value
+        for key, value in stream_provider_schema.items()
+        if key not in ("url", "headers", "auth", "update", "key", "idle_timeout")
+    },
+    voluptuous.Required("type"): "mqtt",
+    voluptuous.Required("host"): str,
+    voluptuous.Required("topics"): voluptuous.Any(str, [str]),
+    voluptuous.Optional("port", default=1883): voluptuous.All(
+        int, voluptuous.Range(1, 65535)
+    ),
+    voluptuous.Optional("username"): str,
+    voluptuous.Optional("password"): str,
+    voluptuous.Optional("client_id"): str,
+    voluptuous.Optional("qos", default=0): voluptuous.In([0, 1, 2]),
+    voluptuous.Optional("tls", default=False): bool,
+    voluptuous.Optional("keepalive", default=60): voluptuous.All(
+        int, voluptuous.Range(min=5)
+    ),
+    voluptuous.Optional("coalesce", default=0.05): voluptuous.All(
+        voluptuous.Any(int, float), voluptuous.Range(min=0)
+    ),
+}
+
+file_provider_schema = {
+    **provider_common_schema,
+    voluptuous.Required("type"): "file",
+    voluptuous.Required("path"): str,
+    voluptuous.Optional("format", default="auto"): voluptuous.In(
+        ["auto", "json", "csv", "text"]
+    ),
+    voluptuous.Optional("watch", default=True): bool,
+    voluptuous.Optional("delimiter", default=","): str,
+    voluptuous.Optional("header", default=True): bool,
+    voluptuous.Optional("encoding", default="utf-8"): str,
+    voluptuous.Optional("json_path"): str,
+    voluptuous.Optional("jq_expression"): str,
+}
+
+command_provider_schema = {
+    **provider_common_schema,
+    voluptuous.Required("type"): "command",
+    voluptuous.Required("command"): voluptuous.Any(str, [str]),
+    voluptuous.Optional("shell", default=False): bool,
+    voluptuous.Optional("timeout", default=30): voluptuous.All(
+        voluptuous.Any(int, float), voluptuous.Range(min=0, min_included=False)
+    ),
+    voluptuous.Optional("cwd"): str,
+    voluptuous.Optional("env"): dict,
+    voluptuous.Optional("format", default="auto"): voluptuous.In(
+        ["auto", "json", "text"]
+    ),
+    voluptuous.Optional("json_path"): str,
+    voluptuous.Optional("jq_expression"): str,
+}
+
+
+def _validate_provider(value):
+    """Validate a single provider entry by dispatching to the right sub-schema."""
+    if not isinstance(value, dict) or "type" not in value:
+        raise voluptuous.Invalid("Each provider must be a dict with a 'type' key")
+
+    schemas = {
+        "rest": voluptuous.Schema(rest_provider_schema),
+        "replay": voluptuous.Schema(replay_provider_schema),
+        "sse": voluptuous.Schema(sse_provider_schema),
+        "websocket": voluptuous.Schema(websocket_provider_schema),
+        "mqtt": voluptuous.Schema(mqtt_provider_schema),
+        "file": voluptuous.Schema(file_provider_schema),
+        "command": voluptuous.Schema(command_provider_schema),
+    }
+
+    provider_type = value["type"]
+    if provider_type not in schemas:
+        raise voluptuous.Invalid(
+            f"Unknown provider type '{provider_type}'. "
+            f"Available: {list(schemas.keys())}"
+        )
+
+    return schemas[provider_type](value)
+
+
 provider_schema = voluptuous.Schema(
     {
-        voluptuous.Required("providers"): {
-            str: {
-                voluptuous.Required("type"): voluptuous.In(["rest"]),
-                voluptuous.Required("url"): str,
-                voluptuous.Optional("method", default="GET"): voluptuous.In(
-                    ["GET", "POST", "PUT", "DELETE"]
-                ),
-                voluptuous.Optional("headers"): dict,
-                voluptuous.Optional("params"): dict,
-                voluptuous.Optional("body"): voluptuous.Any(dict, str),
-                voluptuous.Optional("payload"): voluptuous.Any(dict, str),
-                voluptuous.Optional("auth"): provider_auth_schema,
-                voluptuous.Optional("json_path"): str,
-                voluptuous.Optional("jq_expression"): str,
-                voluptuous.Optional("update_interval", default=60): voluptuous.All(
-                    int, voluptuous.Range(min=1)
-                ),
-                voluptuous.Optional("jitter", default=0): voluptuous.All(
-                    int, voluptuous.Range(min=0)
-                ),
-            }
-        }
+        voluptuous.Optional("runtime"): {
+            voluptuous.Optional("shared", default=False): bool,
+            voluptuous.Optional("max_concurrent_fetches", default=4): voluptuous.All(
+                int, voluptuous.Range(min=1)
+            ),
+            voluptuous.Optional("max_concurrent_commands", default=2): voluptuous.All(
+                int, voluptuous.Range(min=1)
+            ),
+            voluptuous.Optional("startup_stagger", default=0.5): voluptuous.All(
+                voluptuous.Any(int, float), voluptuous.Range(min=0)
+            ),
+        },
+        voluptuous.Optional("record"): str,
+        voluptuous.Optional("cache"): str,
+        voluptuous.Required("providers"): {str: _validate_provider},
     }
 )
 
@@ -1,9 +1,161 @@
-from functools import lru_cache
+from collections import OrderedDict
 
 import pygame
 
 
 class FontCache:
-    @lru_cache(maxsize=32)
+    """Bounded LRU cache of loaded fonts, with per font file statistics.
+
+    Also remembers which size was chosen to fit a given text in a given
+    width, so re-rendering the same text in the same box doesn't measure
+    anything, and a changed text starts its search from the previous size.
+    """
+
+    def __init__(self, max_fonts=256, max_fits=2048):
+        self.max_fonts = max_fonts
+        self.max_fits = max_fits
+        self._fonts = OrderedDict()
+        self._fits = OrderedDict()
+        self._stats = {}
+
+    def _file_stats(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "fit_hits": 0,
+                "fit_misses": 0,
+            }
+        return stats
+
     def get_font(self, name, size):
-        return pygame.font.Font(name, size)
+        key = (name, size)
+        stats = self._file_stats(name)
+        font = self._fonts.get(key)
+        if font is not None:
+            self._fonts.move_to_end(key)
+            stats["hits"] += 1
+            return font
+
+        stats["misses"] += 1
+        font = pygame.font.Font(name, size)
+        self._fonts[key] = font
+        if len(self._fonts) > self.max_fonts:
+            (evicted_name, _), _ = self._fonts.popitem(last=False)
+            self._file_stats(evicted_name)["evictions"] += 1
+        return font
+
+    def fit_text_size(self, name, text, max_size, max_width, hint=None):
+        """Find the largest font size up to max_size at which text fits in max_width.
+
+        Uses a binary search over font sizes. If hint is given (typically
+        the size chosen for the previous text in the same box), the search
+        first checks whether the hint is still the answer.
+
+        Returns:
+            Font size, at least 1.
+        """
+        key = (name, text, max_size, max_width)
+        stats = self._file_stats(name)
+        size = self._fits.get(key)
+        if size is not None:
+            self._fits.move_to_end(key)
+            stats["fit_hits"] += 1
+            return size
+
+        stats["fit_misses"] += 1
+
+        def fits(candidate):
+            return self.get_font(name, candidate).size(text)[0] <= max_width
+
+        # Invariant: every size below low fits, every size above high doesn't
+        low, high = 1, max_size
+        if hint is not None and 1 <= hint <= max_size:
+            if not fits(hint):
+                high = hint - 1
+            elif hint == max_size or not fits(hint + 1):
+                low, high = hint + 1, hint
+            else:
+                low = hint + 2
+
+        result = low - 1
+        while low <= high:
+            middle = (low + high) // 2
+            if fits(middle):
+                result = middle
+                low = middle + 1
+            else:
+                high = middle - 1
+        size = max(result, 1)
+
+        self._fits[key] = size
+        if len(self._fits) > self.max_fits:
+            self._fits.popitem(last=False)
+        return size
+
+    def get_stats(self):
+        """Return cache statistics per font file.
+
+        Returns:
+            Dict mapping font file (or "default") to hit/miss/eviction counts.
+        """
+        return {
+            name or "default": dict(stats) for name, stats in self._stats.items()
+        }
+
+
+class TextSurfaceCache:
+    """LRU cache of rendered text surfaces, bounded by their size in bytes.
+
+    Values like temperatures or clock strings recur constantly, so the
+    antialiased rasterization is kept and reused. Returned surfaces are
+    shared and must not be drawn on.
+    """
+
+    def __init__(self, fonts, max_bytes=4 * 1024 * 1024):
+        self.fonts = fonts
+        self.max_bytes = max_bytes
+        self._surfaces = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, name, size, text, color):
+        key = (name, size, text, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get_font(name, size).render(text, True, color)
+        surface_bytes = surface.get_pitch() * surface.get_height()
+        if surface_bytes > self.max_bytes:
+            return surface
+
+        self._surfaces[key] = surface
+        self._bytes += surface_bytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._surfaces.popitem(last=False)
+            self._bytes -= evicted.get_pitch() * evicted.get_height()
+            self.evictions += 1
+        return surface
+
+    def get_stats(self):
+        """Return hit/miss counters and current memory use."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._surfaces),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+font_cache = FontCache()
+text_cache = TextSurfaceCache(font_cache)
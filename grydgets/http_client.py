@@ -0,0 +1,275 @@
+"""Shared HTTP client with per-host connection pooling.
+
+All HTTP requests made by providers, widgets and outputs go through the
+module-level ``http_client`` so that connections (and TLS sessions) are kept
+alive and reused between polls instead of being re-established every time.
+
+Polling requests go through ``http_client.fetch()``, which additionally
+coalesces identical requests made by different providers and widgets.
+"""
+
+import http.cookiejar
+import json
+import logging
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Request arguments that can be part of a shared request
+SHAREABLE_ARGUMENTS = {'headers', 'params', 'json', 'data', 'timeout'}
+
+
+def request_key(method, url, **kwargs):
+    """Return a canonical, hashable form of a request.
+
+    Two requests with the same key are guaranteed to be answered the same
+    way, regardless of header name case or the order of query parameters.
+
+    Returns:
+        Tuple, or None if the request must not be shared with anyone (it is
+        not a GET/HEAD, or uses arguments that aren't understood here).
+    """
+    method = method.upper()
+    if method not in ('GET', 'HEAD') or set(kwargs) - SHAREABLE_ARGUMENTS:
+        return None
+
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    params = kwargs.get('params') or {}
+    if isinstance(params, dict):
+        params = params.items()
+    query += [(str(name), str(value)) for name, value in params]
+
+    headers = kwargs.get('headers') or {}
+    try:
+        body = json.dumps(kwargs.get('json'), sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    data = kwargs.get('data')
+    if data is not None and not isinstance(data, (str, bytes)):
+        return None
+
+    return (
+        method,
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or '/',
+        tuple(sorted(query)),
+        tuple(sorted((name.lower(), str(value)) for name, value in headers.items())),
+        body,
+        data,
+        kwargs.get('timeout'),
+    )
+
+
+class PendingRequest:
+    """An in-flight shared request that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class HTTPClient:
+    """Keeps one pooled requests.Session per host, and coalesces identical requests."""
+
+    def __init__(self, pool_size=10, keep_alive=True, timeout=30, coalesce_window=1):
+        """Initialize the client.
+
+        Args:
+            pool_size: Maximum number of connections kept open per host (default: 10)
+            keep_alive: Reuse connections between requests (default: True)
+            timeout: Default request timeout in seconds (default: 30)
+            coalesce_window: Seconds during which a completed shared request
+                is reused for identical requests (default: 1)
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.coalesce_window = coalesce_window
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._stats = {}
+        self._in_flight = {}
+        self._recent = {}
+
+        self.logger = logging.getLogger('HTTPClient')
+
+    def configure(self, pool_size=10, keep_alive=True, timeout=30, coalesce_window=1):
+        """Change pool settings. Existing connections are closed if anything changed."""
+        with self._lock:
+            self.coalesce_window = coalesce_window
+            self._recent = {}
+
+        if (pool_size, keep_alive, timeout) == (
+            self.pool_size,
+            self.keep_alive,
+            self.timeout,
+        ):
+            return
+
+        self.logger.info(
+            f"Configuring HTTP client: pool_size={pool_size}, "
+            f"keep_alive={keep_alive}, timeout={timeout}"
+        )
+        with self._lock:
+            self.pool_size = pool_size
+            self.keep_alive = keep_alive
+            self.timeout = timeout
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+
+        for session in sessions:
+            session.close()
+
+    def _get_session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # Sessions are shared by everything polling the host, so
+                # requests stay stateless: never store cookies from one
+                # response to send them along with another caller's request
+                session.cookies.set_policy(
+                    http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                if not self.keep_alive:
+                    session.headers['Connection'] = 'close'
+                self._sessions[host] = session
+                self._host_stats(host)
+            return session
+
+    def _host_stats(self, host):
+        # Callers must hold self._lock
+        return self._stats.setdefault(
+            host, {'requests': 0, 'errors': 0, 'coalesced': 0}
+        )
+
+    def request(self, method, url, **kwargs):
+        """Perform an HTTP request on the pooled session for the URL's host.
+
+        Accepts the same arguments as requests.request(). If no timeout is
+        given, the client's default timeout is used.
+
+        Returns:
+            requests.Response
+        """
+        host = urlsplit(url).netloc
+        session = self._get_session(host)
+        kwargs.setdefault('timeout', self.timeout)
+
+        try:
+            response = session.request(method=method, url=url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._stats[host]['errors'] += 1
+            raise
+
+        with self._lock:
+            self._stats[host]['requests'] += 1
+        return response
+
+    def fetch(self, method, url, **kwargs):
+        """Perform a request, sharing it with identical concurrent requests.
+
+        If an identical GET/HEAD request is already in flight, this waits for
+        it and returns the same response instead of sending another one. A
+        successful response is also reused for identical requests made within
+        coalesce_window seconds. Other requests are sent as with request().
+
+        Returns:
+            requests.Response, possibly shared with other callers, which must
+            treat it as read-only.
+        """
+        key = request_key(method, url, **kwargs)
+        if key is None:
+            return self.request(method, url, **kwargs)
+
+        host = urlsplit(url).netloc
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is not None and time.time() - recent[0] <= self.coalesce_window:
+                self._host_stats(host)['coalesced'] += 1
+                return recent[1]
+
+            pending = self._in_flight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._in_flight[key] = PendingRequest()
+            else:
+                self._host_stats(host)['coalesced'] += 1
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.response
+
+        try:
+            response = self.request(method, url, **kwargs)
+            # Read the body now, so that followers never touch the connection
+            response.content
+            pending.response = response
+            return response
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if pending.response is not None and self.coalesce_window > 0:
+                    now = time.time()
+                    self._recent = {
+                        recent_key: recent
+                        for recent_key, recent in self._recent.items()
+                        if now - recent[0] <= self.coalesce_window
+                    }
+                    self._recent[key] = (now, pending.response)
+            pending.done.set()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self):
+        """Return per-host request and connection pool statistics.
+
+        Returns:
+            Dict mapping host to a dict with request, error, coalesced request
+            and connection counts.
+        """
+        stats = {}
+        with self._lock:
+            for host, session in self._sessions.items():
+                host_stats = dict(self._stats[host])
+                host_stats['connections_opened'] = 0
+                host_stats['idle_connections'] = 0
+                for adapter in set(session.adapters.values()):
+                    pools = adapter.poolmanager.pools
+                    for key in pools.keys():
+                        pool = pools.get(key)
+                        if pool is None:
+                            continue
+                        host_stats['connections_opened'] += pool.num_connections
+                        if pool.pool is not None:
+                            host_stats['idle_connections'] += sum(
+                                1 for conn in list(pool.pool.queue) if conn is not None
+                            )
+                stats[host] = host_stats
+        return stats
+
+
+http_client = HTTPClient()
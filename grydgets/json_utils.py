@@ -1,15 +1,17 @@
+from functools import lru_cache
+
 import jq
 
 
-def extract_json_path(data, json_path):
-    """Extract data using simple JSON path notation.
+@lru_cache(maxsize=None)
+def parse_json_path(json_path):
+    """Split a simple JSON path into a tuple of keys and indices.
 
     Args:
-        data: The JSON data structure
         json_path: Path string like "field[0].subfield"
 
     Returns:
-        Extracted data
+        Tuple like ("field", 0, "subfield")
     """
     json_path_list = list()
     for segment in json_path.replace("]", "").split("."):
@@ -17,8 +19,34 @@ def extract_json_path(data, json_path):
         json_path_list.append(sub_segments[0])
         if len(sub_segments) > 1:
             json_path_list += [int(array_index) for array_index in sub_segments[1:]]
-    while json_path_list:
-        data = data[json_path_list.pop(0)]
+    return tuple(json_path_list)
+
+
+@lru_cache(maxsize=None)
+def compile_jq(jq_expression):
+    """Compile a jq expression, reusing earlier compilations of the same string.
+
+    Args:
+        jq_expression: jq expression string like ".field[0].subfield"
+
+    Returns:
+        Compiled jq program
+    """
+    return jq.compile(jq_expression)
+
+
+def extract_json_path(data, json_path):
+    """Extract data using simple JSON path notation.
+
+    Args:
+        data: The JSON data structure
+        json_path: Path string like "field[0].subfield"
+
+    Returns:
+        Extracted data
+    """
+    for key in parse_json_path(json_path):
+        data = data[key]
     return data
 
 
@@ -32,7 +60,61 @@ def extract_with_jq(data, jq_expression):
     Returns:
         Extracted data (first result if multiple results)
     """
-    return jq.compile(jq_expression).input_value(data).first()
+    return compile_jq(jq_expression).input_value(data).first()
+
+
+class Extractor:
+    """A json_path and/or jq_expression pair, parsed and compiled once.
+
+    Widgets and providers build their extractor at construction time so that
+    the render path never re-parses expressions.
+    """
+
+    def __init__(self, json_path=None, jq_expression=None):
+        """Initialize the extractor.
+
+        Args:
+            json_path: Optional simple JSON path like "field[0].subfield"
+            jq_expression: Optional jq expression like ".field[0] | select(.active)"
+
+        Raises:
+            ValueError: If neither json_path nor jq_expression is provided,
+                or if the jq expression does not compile
+        """
+        if json_path is None and jq_expression is None:
+            raise ValueError("Either json_path or jq_expression must be provided")
+
+        self.json_path = json_path
+        self.jq_expression = jq_expression
+        self._path = parse_json_path(json_path) if json_path else ()
+        self._program = compile_jq(jq_expression) if jq_expression else None
+
+    def extract(self, data):
+        """Apply json_path first if provided, then the jq expression.
+
+        Args:
+            data: The JSON data structure
+
+        Returns:
+            Extracted data
+        """
+        for key in self._path:
+            data = data[key]
+        if self._program is not None:
+            data = self._program.input_value(data).first()
+        return data
+
+
+@lru_cache(maxsize=None)
+def get_extractor(json_path=None, jq_expression=None):
+    """Return a shared Extractor for the given expressions.
+
+    Returns:
+        Extractor, or None if neither json_path nor jq_expression is set
+    """
+    if not json_path and not jq_expression:
+        return None
+    return Extractor(json_path=json_path, jq_expression=jq_expression)
 
 
 def extract_data(data, json_path=None, jq_expression=None):
@@ -55,12 +137,7 @@ def extract_data(data, json_path=None, jq_expression=None):
     if json_path is None and jq_expression is None:
         raise ValueError("Either json_path or jq_expression must be provided")
 
-    # Apply json_path first if provided
-    if json_path:
-        data = extract_json_path(data, json_path)
-
-    # Apply jq expression if provided
-    if jq_expression:
-        data = extract_with_jq(data, jq_expression)
-
-    return data
+    extractor = get_extractor(json_path, jq_expression)
+    if extractor is None:
+        return data
+    return extractor.extract(data)
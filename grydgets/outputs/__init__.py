@@ -30,18 +30,48 @@ class Output:
         """Does this output want a frame right now?"""
         return False
 
-    def on_frame(self, surface: pygame.Surface, freshly_rendered: bool) -> None:
+    def next_deadline(self) -> float | None:
+        """When will this output next want a frame, even if nothing is dirty?
+
+        Returns:
+            Unix timestamp, or None if the output only reacts to new frames.
+        """
+        return None
+
+    def on_frame(
+        self,
+        surface: pygame.Surface,
+        freshly_rendered: bool,
+        damage: list[pygame.Rect] | None = None,
+    ) -> None:
         """Receive the rendered surface.
 
         Args:
             surface: The current frame.
             freshly_rendered: True if re-rendered this frame (False = identical to last).
+            damage: Areas that changed since the previous frame, or None if
+                the whole surface should be considered changed.
         """
 
     def stop(self) -> None:
         """Clean shutdown."""
 
 
+def present_surface(
+    display_surface: pygame.Surface,
+    surface: pygame.Surface,
+    damage: list[pygame.Rect] | None,
+) -> None:
+    """Copy a frame to the display, updating only the damaged areas if known."""
+    if damage is None:
+        display_surface.blit(surface, (0, 0))
+        pygame.display.flip()
+    elif damage:
+        for rect in damage:
+            display_surface.blit(surface, rect.topleft, area=rect)
+        pygame.display.update(damage)
+
+
 OUTPUT_TYPES: dict[str, type[Output]] = {}
 
 
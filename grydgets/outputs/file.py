@@ -42,7 +42,15 @@ class FileOutput(Output):
     def wants_update(self) -> bool:
         return (time.time() - self._last_save_time) >= self.render_interval
 
-    def on_frame(self, surface: pygame.Surface, freshly_rendered: bool) -> None:
+    def next_deadline(self) -> float | None:
+        return self._last_save_time + self.render_interval
+
+    def on_frame(
+        self,
+        surface: pygame.Surface,
+        freshly_rendered: bool,
+        damage: list[pygame.Rect] | None = None,
+    ) -> None:
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = self.filename_pattern.format(
             timestamp=timestamp, sequence=self._sequence
@@ -6,8 +6,8 @@ import time
 from typing import Any
 
 import pygame
-import requests
 
+from grydgets.http_client import http_client
 from grydgets.outputs import Output, register_output
 
 
@@ -44,7 +44,19 @@ class PostOutput(Output):
             return False
         return (time.time() - self._last_post_time) >= self.min_interval
 
-    def on_frame(self, surface: pygame.Surface, freshly_rendered: bool) -> None:
+    def next_deadline(self) -> float | None:
+        if self.trigger == "on_dirty" and not self._pending_dirty:
+            return None
+        if self._worker_thread and self._worker_thread.is_alive():
+            return time.time() + 1
+        return self._last_post_time + self.min_interval
+
+    def on_frame(
+        self,
+        surface: pygame.Surface,
+        freshly_rendered: bool,
+        damage: list[pygame.Rect] | None = None,
+    ) -> None:
         if self.trigger == "on_dirty" and not freshly_rendered:
             return
 
@@ -93,7 +105,7 @@ class PostOutput(Output):
                 headers["Content-Type"] = content_type
                 kwargs["data"] = image_bytes
 
-            response = requests.post(
+            response = http_client.post(
                 self.url, headers=headers, timeout=30, **kwargs
             )
             self.logger.debug(f"POST {self.url} -> {response.status_code}")
@@ -107,7 +119,7 @@ class PostOutput(Output):
         try:
             method = self.after_post.get("method", "GET")
             url = self.after_post["url"]
-            response = requests.request(method, url, timeout=30)
+            response = http_client.request(method, url, timeout=30)
             self.logger.debug(f"after_post {method} {url} -> {response.status_code}")
         except Exception as e:
             self.logger.warning(f"after_post failed: {e}")
@@ -5,7 +5,7 @@ from typing import Any
 
 import pygame
 
-from grydgets.outputs import Output, register_output
+from grydgets.outputs import Output, present_surface, register_output
 
 
 @register_output("window")
@@ -36,7 +36,11 @@ class WindowOutput(Output):
     def wants_update(self) -> bool:
         return True
 
-    def on_frame(self, surface: pygame.Surface, freshly_rendered: bool) -> None:
+    def on_frame(
+        self,
+        surface: pygame.Surface,
+        freshly_rendered: bool,
+        damage: list[pygame.Rect] | None = None,
+    ) -> None:
         if freshly_rendered and self._display_surface is not None:
-            self._display_surface.blit(surface, (0, 0))
-            pygame.display.flip()
+            present_surface(self._display_surface, surface, damage)
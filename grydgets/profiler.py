@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import deque
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def summarize(samples, total, maximum):
+    ordered = sorted(samples)
+    return {
+        "total": round(total * 1000, 3),
+        "p50": round(percentile(ordered, 0.5) * 1000, 3),
+        "p95": round(percentile(ordered, 0.95) * 1000, 3),
+        "max": round(maximum * 1000, 3),
+    }
+
+
+class WidgetStats:
+    """Timing counters for a single widget.
+
+    Percentiles are computed over the last history samples; totals, counts
+    and maxima cover the widget's whole lifetime.
+    """
+
+    def __init__(self, widget_type, first_frame, history):
+        self.widget_type = widget_type
+        self.first_frame = first_frame
+        self.renders = 0
+        self.render_time = 0.0
+        self.render_self_time = 0.0
+        self.render_max = 0.0
+        self.render_samples = deque(maxlen=history)
+        self.ticks = 0
+        self.tick_time = 0.0
+        self.tick_max = 0.0
+        self.tick_samples = deque(maxlen=history)
+
+
+class RenderProfiler:
+    """Per-widget render and tick timings, keyed by unique_name.
+
+    Widgets are instrumented with attach(), which wraps their render() and
+    tick() methods. Render time is recorded both inclusive of nested
+    widgets and as self time, so a container shows up as expensive only if
+    its own compositing is.
+    """
+
+    def __init__(self, history=256):
+        self.history = history
+        self.frames = 0
+        self._widgets = {}
+        self._render_stack = []
+        self._lock = threading.Lock()
+
+    def attach(self, widget):
+        """Start recording render and tick timings for widget."""
+        with self._lock:
+            stats = WidgetStats(type(widget).__name__, self.frames, self.history)
+            self._widgets[widget.unique_name] = stats
+
+        original_render = widget.render
+        original_tick = widget.tick
+
+        def render(size):
+            self._render_stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original_render(size)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._render_stack.pop()
+                if self._render_stack:
+                    self._render_stack[-1] += elapsed
+                with self._lock:
+                    stats.renders += 1
+                    stats.render_time += elapsed
+                    stats.render_self_time += elapsed - nested
+                    stats.render_max = max(stats.render_max, elapsed)
+                    stats.render_samples.append(elapsed)
+
+        def tick():
+            start = time.perf_counter()
+            try:
+                original_tick()
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    stats.ticks += 1
+                    stats.tick_time += elapsed
+                    stats.tick_max = max(stats.tick_max, elapsed)
+                    stats.tick_samples.append(elapsed)
+
+        widget.render = render
+        widget.tick = tick
+
+    def detach(self, widget):
+        """Forget the timings of a widget that was removed from the tree."""
+        with self._lock:
+            self._widgets.pop(widget.unique_name, None)
+
+    def frame(self):
+        """Record that the screen was rendered once."""
+        with self._lock:
+            self.frames += 1
+
+    def reset(self):
+        """Forget all widgets, e.g. before the widget tree is rebuilt."""
+        with self._lock:
+            self.frames = 0
+            self._widgets = {}
+            self._render_stack = []
+
+    def get_stats(self):
+        """Return timings per widget, in milliseconds.
+
+        dirty_ratio is the fraction of screen renders since the widget was
+        created in which the widget itself had to be rendered.
+        """
+        with self._lock:
+            widgets = {}
+            for name, stats in self._widgets.items():
+                frames = self.frames - stats.first_frame
+                render_ms = summarize(
+                    stats.render_samples, stats.render_time, stats.render_max
+                )
+                render_ms["self_total"] = round(stats.render_self_time * 1000, 3)
+                widgets[name] = {
+                    "type": stats.widget_type,
+                    "renders": stats.renders,
+                    "render_ms": render_ms,
+                    "ticks": stats.ticks,
+                    "tick_ms": summarize(
+                        stats.tick_samples, stats.tick_time, stats.tick_max
+                    ),
+                    "dirty_ratio": round(min(stats.renders / frames, 1), 3)
+                    if frames
+                    else 0.0,
+                }
+            return {"frames": self.frames, "widgets": widgets}
+
+
+profiler = RenderProfiler()
@@ -6,7 +6,30 @@ redundant API calls.
 """
 
 from grydgets.providers.base import DataProvider
+from grydgets.providers.cache import SnapshotCache
+from grydgets.providers.history import ProviderHistory
 from grydgets.providers.rest import RestDataProvider
+from grydgets.providers.recording import ProviderRecorder, ReplayDataProvider, load_recording
+from grydgets.providers.stream import SSEDataProvider, WebSocketDataProvider
+from grydgets.providers.mqtt import MQTTDataProvider
+from grydgets.providers.file import FileDataProvider
+from grydgets.providers.command import CommandDataProvider
+from grydgets.providers.runtime import ProviderRuntime
 from grydgets.providers.manager import ProviderManager
 
-__all__ = ['DataProvider', 'RestDataProvider', 'ProviderManager']
+__all__ = [
+    'DataProvider',
+    'ProviderHistory',
+    'SnapshotCache',
+    'RestDataProvider',
+    'ReplayDataProvider',
+    'SSEDataProvider',
+    'WebSocketDataProvider',
+    'MQTTDataProvider',
+    'FileDataProvider',
+    'CommandDataProvider',
+    'ProviderRecorder',
+    'load_recording',
+    'ProviderRuntime',
+    'ProviderManager',
+]
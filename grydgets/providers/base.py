@@ -5,24 +5,77 @@ import random
 import threading
 import time
 
+from grydgets.json_utils import get_extractor
+from grydgets.providers.history import ProviderHistory
+from grydgets.scheduler import scheduler
+
+# Returned by _fetch_data() when the source reports that nothing changed
+NOT_MODIFIED = object()
+
+# Circuit breaker states, see DataProvider.get_circuit_state()
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half-open'
+
 
 class DataProvider:
-    """Base class for data providers that fetch data in background threads.
+    """Base class for data providers that fetch data in the background.
 
     Providers continuously fetch data and make it available to widgets.
     Multiple widgets can share the same provider to avoid redundant API calls.
+    Each provider either runs its own fetch thread or is scheduled on a
+    shared ProviderRuntime.
+
+    Failed fetches are retried with exponential backoff. After
+    failure_threshold consecutive failures the provider's circuit opens,
+    which is reported in get_error(); the next fetch after the backoff is a
+    probe that closes the circuit again if it succeeds. For up to stale_ttl
+    seconds after fetches started failing, the last good data keeps being
+    served, without any error, so widgets aren't blanked by short outages.
+
+    With a SnapshotCache, the last good data is also kept on disk and
+    restored when the provider is created; it is marked stale until the
+    first successful fetch.
     """
 
-    def __init__(self, update_interval=60, jitter=0, **kwargs):
+    # Attributes used to revalidate data, saved along with snapshots so the
+    # first fetch after a restart can be a cheap conditional request
+    SNAPSHOT_VALIDATORS = ()
+
+    def __init__(
+        self,
+        update_interval=60,
+        jitter=0,
+        backoff_factor=2,
+        max_backoff=300,
+        failure_threshold=3,
+        stale_ttl=0,
+        history=None,
+        **kwargs,
+    ):
         """Initialize the data provider.
 
         Args:
             update_interval: Seconds between data fetches (default: 60)
             jitter: Random seconds to add to update interval (default: 0)
+            backoff_factor: Factor the retry delay grows by with each
+                consecutive failure (default: 2)
+            max_backoff: Maximum retry delay in seconds; never shorter than
+                update_interval (default: 300)
+            failure_threshold: Consecutive failures after which the circuit
+                opens (default: 3)
+            stale_ttl: Seconds to keep serving the last good data after
+                fetches started failing (default: 0)
+            history: Optional dict of ProviderHistory arguments, to keep a
+                time series of a value extracted from the data
             **kwargs: Additional provider-specific configuration
         """
         self.update_interval = update_interval
         self.jitter = jitter
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max(max_backoff, update_interval)
+        self.failure_threshold = failure_threshold
+        self.stale_ttl = stale_ttl
         self.name = kwargs.get('name', type(self).__name__)
 
         # Thread-safe data storage
@@ -31,30 +84,69 @@ class DataProvider:
         self.last_update_time = 0
         self.error_state = None
 
+        # Extractions registered by widgets, and their results for self.data
+        self._extractors = set()
+        self._extracted = {}
+
+        # Optional ProviderRecorder that fetched payloads are written to
+        self.recorder = None
+
+        # Optional SnapshotCache that new data is saved to
+        self.snapshot_cache = None
+        # Whether the data was restored from a snapshot and not confirmed yet
+        self.stale = False
+
+        # Optional time series of a value in the data
+        self.history = ProviderHistory(**history) if history is not None else None
+
+        # Failure tracking, only touched by the fetching thread
+        self.circuit_state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.failing_since = None
+        self._retry_delay = None
+
         # Thread management
         self._stop_event = threading.Event()
         self._thread = None
+        self._runtime = None
+        self._start_delay = 0
 
         # Logging
         self.logger = logging.getLogger(f"{type(self).__name__}({self.name})")
 
-    def start(self):
-        """Start the background fetch thread."""
-        if self._thread is not None:
+    def start(self, runtime=None, delay=0):
+        """Start fetching data in the background.
+
+        Args:
+            runtime: Optional shared ProviderRuntime to schedule fetches on.
+                If not given, the provider runs its own fetch thread.
+            delay: Seconds to wait before the first fetch (default: 0)
+        """
+        if self._thread is not None or self._runtime is not None:
             self.logger.warning("Provider already started")
             return
 
         self.logger.info("Starting provider")
-        self._thread = threading.Thread(target=self._fetch_loop, daemon=True)
-        self._thread.start()
+        self._start_delay = delay
+        if runtime is not None:
+            self._runtime = runtime
+            runtime.add(self, due=time.time() + delay if delay else None)
+        else:
+            self._thread = threading.Thread(target=self._fetch_loop, daemon=True)
+            self._thread.start()
 
     def stop(self):
-        """Stop the background fetch thread."""
+        """Stop fetching data, and save the history if it is persisted."""
         self.logger.info("Stopping provider")
         self._stop_event.set()
+        if self._runtime is not None:
+            self._runtime.remove(self)
+            self._runtime = None
         if self._thread is not None:
             self._thread.join(timeout=5)
             self._thread = None
+        if self.history is not None:
+            self.history.save()
 
     def get_data(self):
         """Get the current data (thread-safe).
@@ -65,6 +157,125 @@ class DataProvider:
         with self.lock:
             return self.data
 
+    def register_extraction(self, json_path=None, jq_expression=None):
+        """Register an extraction to be computed once per fetched snapshot.
+
+        Widgets sharing a provider register their json_path/jq_expression at
+        construction. Results are computed when new data arrives and shared
+        by all widgets using the same expressions.
+
+        Args:
+            json_path: Optional simple JSON path like "field[0].subfield"
+            jq_expression: Optional jq expression
+
+        Returns:
+            Extractor to pass to get_extracted(), or None if neither was given.
+        """
+        extractor = get_extractor(json_path, jq_expression)
+        if extractor is not None:
+            with self.lock:
+                self._extractors.add(extractor)
+        return extractor
+
+    def get_extracted(self, extractor):
+        """Get the result of an extraction on the current data (thread-safe).
+
+        Args:
+            extractor: Extractor returned by register_extraction(), or None
+                for the raw data
+
+        Returns:
+            The extracted value.
+
+        Raises:
+            Exception: Whatever the extraction raised for the current data.
+        """
+        with self.lock:
+            data = self.data
+            extracted = self._extracted
+
+        if extractor is None:
+            return data
+
+        if extractor in extracted:
+            result = extracted[extractor]
+        else:
+            result = self._run_extraction(extractor, data)
+            with self.lock:
+                if self.data is data:
+                    self._extracted[extractor] = result
+
+        if isinstance(result, Exception):
+            raise result.with_traceback(None)
+        return result
+
+    def set_data(self, data):
+        """Replace the current data, as if it had just been fetched.
+
+        Registered extractions are computed before the new data becomes
+        visible, and the main loop is woken up so widgets pick it up.
+
+        Args:
+            data: The new data snapshot
+        """
+        # Precompute registered extractions outside the lock
+        with self.lock:
+            extractors = list(self._extractors)
+        extracted = {
+            extractor: self._run_extraction(extractor, data)
+            for extractor in extractors
+        }
+
+        with self.lock:
+            self.data = data
+            self._extracted = extracted
+            self.last_update_time = time.time()
+            self.error_state = None
+            self.stale = False
+
+        if self.history is not None:
+            self.history.record(data)
+        scheduler.wake()
+
+    def restore_snapshot(self, data, timestamp, validators):
+        """Restore data saved by a SnapshotCache, before the provider starts.
+
+        The data keeps its original timestamp and is marked stale until a
+        fetch confirms or replaces it.
+
+        Args:
+            data: The saved data snapshot
+            timestamp: Unix timestamp of when the data was fetched
+            validators: Dict of SNAPSHOT_VALIDATORS attribute values
+        """
+        with self.lock:
+            extractors = list(self._extractors)
+        extracted = {
+            extractor: self._run_extraction(extractor, data)
+            for extractor in extractors
+        }
+
+        with self.lock:
+            self.data = data
+            self._extracted = extracted
+            self.last_update_time = timestamp
+            self.stale = True
+        for name in self.SNAPSHOT_VALIDATORS:
+            if name in validators:
+                setattr(self, name, validators[name])
+
+    def is_stale(self):
+        """Check whether the data is a restored snapshot not confirmed by a fetch yet."""
+        with self.lock:
+            return self.stale
+
+    def _run_extraction(self, extractor, data):
+        """Apply an extractor, returning the exception instead of raising it."""
+        try:
+            return extractor.extract(data)
+        except Exception as e:
+            return e
+
     def get_timestamp(self):
         """Get the timestamp of the last successful update (thread-safe).
 
@@ -77,48 +288,157 @@ class DataProvider:
     def get_error(self):
         """Get the current error state (thread-safe).
 
+        While stale data is being served, this is None. Once the circuit is
+        open, the message ends with "(circuit open)".
+
         Returns:
             Error message string, or None if no error.
         """
         with self.lock:
             return self.error_state
 
+    def get_circuit_state(self):
+        """Get the circuit breaker state.
+
+        Returns:
+            CIRCUIT_CLOSED, CIRCUIT_OPEN, or CIRCUIT_HALF_OPEN while a probe
+            fetch is running after the circuit opened.
+        """
+        return self.circuit_state
+
     def _fetch_loop(self):
         """Main fetch loop that runs in the background thread."""
-        # Perform initial fetch immediately
+        if self._stop_event.wait(timeout=self._start_delay):
+            return
         self._perform_fetch()
 
         while not self._stop_event.is_set():
-            # Calculate next update time with jitter
-            sleep_time = self.update_interval
-            if self.jitter > 0:
-                sleep_time += random.uniform(0, self.jitter)
-
             # Sleep with periodic checks for stop event
-            if self._stop_event.wait(timeout=sleep_time):
+            if self._stop_event.wait(timeout=self._next_interval()):
                 break
 
             self._perform_fetch()
 
+    def _next_interval(self):
+        """Return the number of seconds until the next fetch, including jitter.
+
+        After a failure, this is the backoff delay instead.
+        """
+        if self._retry_delay is not None:
+            return self._retry_delay
+
+        sleep_time = self.update_interval
+        if self.jitter > 0:
+            sleep_time += random.uniform(0, self.jitter)
+        return sleep_time
+
     def _perform_fetch(self):
-        """Perform a single fetch operation."""
+        """Perform a single fetch operation.
+
+        The update timestamp only advances when the data or error state
+        actually changed, so widgets don't re-render for identical data.
+        """
+        if self.circuit_state == CIRCUIT_OPEN:
+            self.circuit_state = CIRCUIT_HALF_OPEN
+
         try:
             self.logger.debug("Fetching data")
             new_data = self._fetch_data()
+            self._reset_failures()
 
-            # Update with lock
-            with self.lock:
-                self.data = new_data
-                self.last_update_time = time.time()
-                self.error_state = None
+            if new_data is NOT_MODIFIED:
+                with self.lock:
+                    data = self.data
+                    self.stale = False
+                    changed = self.error_state is not None
+                    if changed:
+                        self.error_state = None
+                        self.last_update_time = time.time()
+                # Unchanged data is still a sample of the time series
+                if self.history is not None and data is not None:
+                    version = self.history.version
+                    self.history.record(data)
+                    changed = changed or self.history.version != version
+                self.logger.debug("Data unchanged")
+                if changed:
+                    scheduler.wake()
+                return
 
+            self._publish(new_data)
             self.logger.debug("Fetch successful")
 
         except Exception as e:
-            self.logger.error(f"Fetch failed: {e}")
-            with self.lock:
-                self.data = None
-                self.error_state = str(e)
+            self._handle_failure(e)
+
+    def _publish(self, data):
+        """Make newly fetched data current, and record and cache it."""
+        self.set_data(data)
+        if self.recorder is not None:
+            self.recorder.record(self.name, data)
+        if self.snapshot_cache is not None:
+            self.snapshot_cache.save(self)
+
+    def _reset_failures(self):
+        if self.failures:
+            self.logger.info(f"Recovered after {self.failures} failed fetches")
+        self.circuit_state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.failing_since = None
+        self._retry_delay = None
+
+    def _handle_failure(self, error):
+        """Schedule a retry with backoff, and keep or drop the current data."""
+        now = time.time()
+        self.failures += 1
+        if self.failing_since is None:
+            self.failing_since = now
+
+        if self.failures >= self.failure_threshold:
+            if self.circuit_state == CIRCUIT_CLOSED:
+                self.logger.warning(
+                    f"Circuit open after {self.failures} consecutive failures"
+                )
+            self.circuit_state = CIRCUIT_OPEN
+
+        # Exponential backoff with "equal jitter": between half and all of
+        # the delay, so that providers failing together don't retry together.
+        # The exponent is capped, as the delay stops growing at max_backoff
+        # anyway and a float factor would overflow during long outages
+        try:
+            delay = min(
+                self.update_interval * self.backoff_factor ** min(self.failures, 64),
+                self.max_backoff,
+            )
+        except OverflowError:
+            delay = self.max_backoff
+        delay = random.uniform(delay / 2, delay)
+
+        with self.lock:
+            have_data = self.data is not None
+        stale_left = self.failing_since + self.stale_ttl - now
+        if have_data and stale_left > 0:
+            self.logger.error(
+                f"Fetch failed, serving stale data for up to {stale_left:.0f}s: {error}"
+            )
+            # Retry by the time the data expires at the latest
+            self._retry_delay = min(delay, stale_left)
+            return
+
+        self.logger.error(f"Fetch failed: {error}")
+        self._retry_delay = delay
+        error_state = str(error)
+        if self.circuit_state == CIRCUIT_OPEN:
+            error_state += " (circuit open)"
+
+        with self.lock:
+            changed = self.data is not None or self.error_state != error_state
+            self.data = None
+            self._extracted = {}
+            self.error_state = error_state
+            if changed:
+                self.last_update_time = now
+        if changed:
+            scheduler.wake()
 
     def _fetch_data(self):
         """Fetch data from the source.
@@ -126,7 +446,8 @@ class DataProvider:
         This method must be implemented by subclasses.
 
         Returns:
-            The fetched data.
+            The fetched data, or NOT_MODIFIED if the data is known to be
+            identical to what was fetched last time.
 
         Raises:
             Exception: If fetch fails.
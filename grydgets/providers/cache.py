@@ -0,0 +1,152 @@
+"""On-disk cache of the last good snapshot of every provider."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+
+# Format version of snapshot files
+SNAPSHOT_VERSION = 1
+# Minimum seconds between two writes of the same provider's snapshot
+MIN_SAVE_INTERVAL = 10
+
+
+class SnapshotCache:
+    """Keeps each provider's last good data in a JSON file in a directory.
+
+    Snapshots are restored when providers are created, so dashboards show
+    the last known data immediately after a restart or reload, and saved
+    whenever a provider gets new data. Saves of a frequently updating
+    provider are throttled to one every MIN_SAVE_INTERVAL seconds; the
+    latest data is always written eventually, and flush() writes it right
+    away.
+
+    Snapshots are tied to a fingerprint of the provider's configuration, so
+    data fetched with a different URL or extraction is never restored.
+    """
+
+    def __init__(self, directory):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory to keep snapshot files in; created if needed
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # Keyed by provider rather than name, as a provider replaced by a
+        # reload may still save its data while its successor starts
+        self._lock = threading.Lock()
+        self._last_write = weakref.WeakKeyDictionary()
+        self._timers = {}
+        self._fingerprints = weakref.WeakKeyDictionary()
+        self.logger = logging.getLogger("SnapshotCache")
+
+    def path(self, provider_name):
+        file_name = re.sub(r"[^A-Za-z0-9_.-]", "_", provider_name)
+        return os.path.join(self.directory, f"{file_name}.json")
+
+    def restore(self, provider, config):
+        """Load a provider's snapshot into it, if there is one.
+
+        Args:
+            provider: DataProvider instance, not started yet
+            config: The provider's configuration dictionary
+
+        Returns:
+            True if a snapshot was restored.
+        """
+        fingerprint = hashlib.sha1(
+            json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        self._fingerprints[provider] = fingerprint
+
+        path = self.path(provider.name)
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported version {snapshot.get('version')}")
+            if snapshot.get("fingerprint") != fingerprint:
+                self.logger.info(
+                    f"Not restoring snapshot of '{provider.name}': configuration changed"
+                )
+                return False
+            provider.restore_snapshot(
+                snapshot["data"], snapshot["timestamp"], snapshot.get("validators", {})
+            )
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring snapshot {path}: {e}")
+            return False
+
+        age = time.time() - snapshot["timestamp"]
+        self.logger.info(f"Restored snapshot of '{provider.name}' from {age:.0f}s ago")
+        return True
+
+    def save(self, provider):
+        """Save a provider's current data, now or a little later."""
+        with self._lock:
+            if provider in self._timers:
+                return
+            wait = self._last_write.get(provider, 0) + MIN_SAVE_INTERVAL - time.time()
+            if wait > 0:
+                timer = threading.Timer(wait, self._write_later, args=(provider,))
+                timer.daemon = True
+                self._timers[provider] = timer
+                timer.start()
+                return
+            self._last_write[provider] = time.time()
+        self._write(provider)
+
+    def flush(self):
+        """Write all snapshots that are waiting to be saved."""
+        with self._lock:
+            timers = self._timers
+            self._timers = {}
+        for provider, timer in timers.items():
+            timer.cancel()
+            self._write(provider)
+
+    def discard(self, provider):
+        """Drop a pending save of a provider that is being replaced."""
+        with self._lock:
+            timer = self._timers.pop(provider, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _write_later(self, provider):
+        with self._lock:
+            if self._timers.pop(provider, None) is None:
+                # Already written by flush()
+                return
+            self._last_write[provider] = time.time()
+        self._write(provider)
+
+    def _write(self, provider):
+        data = provider.get_data()
+        if data is None:
+            return
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": self._fingerprints.get(provider),
+            "timestamp": provider.get_timestamp(),
+            "data": data,
+            "validators": {
+                name: getattr(provider, name) for name in provider.SNAPSHOT_VALIDATORS
+            },
+        }
+
+        path = self.path(provider.name)
+        temporary_path = f"{path}.tmp"
+        try:
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(temporary_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not save snapshot of '{provider.name}': {e}")
@@ -0,0 +1,195 @@
+"""Command data provider, running local programs through a shared bounded pool."""
+
+import hashlib
+import json
+import logging
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+
+from grydgets.json_utils import get_extractor
+from grydgets.providers.base import DataProvider, NOT_MODIFIED
+
+FORMATS = ("auto", "json", "text")
+
+
+class CommandRunner:
+    """Runs commands for all command providers, at most max_processes at a time.
+
+    Commands that don't finish within their timeout are killed together
+    with everything they started, so a hanging script can't pile up
+    processes poll after poll.
+    """
+
+    def __init__(self, max_processes=2):
+        """Initialize the runner.
+
+        Args:
+            max_processes: Maximum number of commands running at the same
+                time (default: 2)
+        """
+        self.max_processes = max_processes
+        self._slots = threading.BoundedSemaphore(max_processes)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('CommandRunner')
+
+    def configure(self, max_processes=2):
+        """Change the number of concurrent commands, for commands started from now on."""
+        with self._lock:
+            if max_processes == self.max_processes:
+                return
+            self.logger.info(f"Configuring command runner: max_processes={max_processes}")
+            self.max_processes = max_processes
+            self._slots = threading.BoundedSemaphore(max_processes)
+
+    def run(self, args, timeout, shell=False, cwd=None, env=None):
+        """Run a command and wait for it to finish.
+
+        The time spent waiting for a free slot counts towards the timeout.
+
+        Returns:
+            subprocess.CompletedProcess with stdout and stderr as bytes.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command (or waiting for a
+                slot) took longer than timeout seconds
+            OSError: If the command can't be started
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            slots = self._slots
+        if not slots.acquire(timeout=timeout):
+            raise subprocess.TimeoutExpired(args, timeout, output=b"")
+
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(args, timeout, output=b"")
+            process = subprocess.Popen(
+                args,
+                shell=shell,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                # Own process group, so a timeout kills the whole pipeline
+                start_new_session=True,
+            )
+            try:
+                stdout, stderr = process.communicate(timeout=remaining)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+                raise
+            return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+        finally:
+            slots.release()
+
+
+class CommandDataProvider(DataProvider):
+    """Data provider that runs a command and parses its output.
+
+    Output identical to the previous run is recognized by its hash and
+    doesn't advance the timestamp.
+    """
+
+    SNAPSHOT_VALIDATORS = ("output_hash",)
+
+    def __init__(
+        self,
+        command,
+        shell=False,
+        timeout=30,
+        cwd=None,
+        env=None,
+        format="auto",
+        json_path=None,
+        jq_expression=None,
+        **kwargs,
+    ):
+        """Initialize the command provider.
+
+        Args:
+            command: Command line string, or list of arguments
+            shell: Run the command line through the shell, to allow pipes
+                and redirections (default: False)
+            timeout: Seconds after which the command is killed (default: 30)
+            cwd: Working directory for the command
+            env: Dictionary of environment variables added to the
+                environment of grydgets
+            format: json, text, or auto to parse as JSON if possible
+                (default: auto)
+            json_path: JSON path to extract from the parsed output
+            jq_expression: jq expression to extract from the parsed output
+            **kwargs: Additional arguments passed to DataProvider
+        """
+        super().__init__(**kwargs)
+
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format '{format}'. Available: {list(FORMATS)}")
+
+        if shell:
+            if not isinstance(command, str):
+                command = shlex.join(command)
+        elif isinstance(command, str):
+            command = shlex.split(command)
+        self.command = command
+        self.shell = shell
+        self.timeout = timeout
+        self.cwd = cwd
+        self.env = {**os.environ, **{key: str(value) for key, value in env.items()}} if env else None
+        self.format = format
+        self.extractor = get_extractor(json_path, jq_expression)
+
+        # Hash of the last output that was parsed successfully
+        self.output_hash = None
+
+    def _fetch_data(self):
+        """Run the command and parse its output.
+
+        Raises:
+            Exception: If the command fails, times out, or its output can't
+                be parsed
+        """
+        try:
+            result = command_runner.run(
+                self.command,
+                self.timeout,
+                shell=self.shell,
+                cwd=self.cwd,
+                env=self.env,
+            )
+        except subprocess.TimeoutExpired:
+            raise Exception(f"Command timed out after {self.timeout}s")
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            message = stderr.splitlines()[-1] if stderr else "no error output"
+            raise Exception(f"Command exited with status {result.returncode}: {message}")
+
+        output_hash = hashlib.sha1(result.stdout).hexdigest()
+        if output_hash == self.output_hash and self.get_data() is not None:
+            return NOT_MODIFIED
+
+        output = result.stdout.decode("utf-8", errors="replace")
+        if self.format == "json":
+            data = json.loads(output)
+        elif self.format == "auto":
+            try:
+                data = json.loads(output)
+            except ValueError:
+                data = output.strip()
+        else:
+            data = output.strip()
+
+        if self.extractor is not None:
+            data = self.extractor.extract(data)
+        self.output_hash = output_hash
+        return data
+
+
+command_runner = CommandRunner()
@@ -0,0 +1,254 @@
+"""Local file data provider, woken up by inotify where available."""
+
+import csv
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import json
+import mmap
+import os
+import select
+import struct
+import time
+
+from grydgets.json_utils import get_extractor
+from grydgets.providers.base import DataProvider, NOT_MODIFIED
+
+FORMATS = ("auto", "json", "csv", "text")
+
+# Files at least this large are hashed through a memory map instead of
+# being read, so an unchanged file never gets copied into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+# inotify(7) constants
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal inotify(7) binding through ctypes, for Linux.
+
+    Watches directories rather than files, so that files replaced by
+    renaming a new version over them (as most tools do to write atomically)
+    keep being watched.
+    """
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB
+
+    def __init__(self):
+        """Open an inotify instance.
+
+        Raises:
+            OSError: If inotify is not available on this system.
+        """
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches = {}
+
+    def add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), self.MASK
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+        self._watches[wd] = directory
+
+    def wait(self, timeout):
+        """Wait for events.
+
+        Returns:
+            Set of paths that changed, empty if the timeout expired.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        paths = set()
+        offset = 0
+        while offset < len(buffer):
+            wd, _, _, name_length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+            directory = self._watches.get(wd)
+            if directory is not None:
+                paths.add(os.path.join(directory, os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileDataProvider(DataProvider):
+    """Data provider that reads a local JSON, CSV or text file.
+
+    The file is only parsed again after it was modified: the modification
+    time, size and inode are checked first, then the content hash, so a
+    file rewritten with identical content doesn't advance the timestamp.
+
+    On Linux the file's directory is watched with inotify and the file is
+    re-read as soon as it is written; update_interval is then only a
+    safety net. Elsewhere, or if watching fails, the file is polled every
+    update_interval seconds.
+    """
+
+    SNAPSHOT_VALIDATORS = ("content_hash",)
+
+    def __init__(
+        self,
+        path,
+        format="auto",
+        watch=True,
+        delimiter=",",
+        header=True,
+        json_path=None,
+        jq_expression=None,
+        encoding="utf-8",
+        **kwargs,
+    ):
+        """Initialize the file provider.
+
+        Args:
+            path: Path of the file to read
+            format: json, csv, text, or auto to pick one from the file
+                extension (default: auto)
+            watch: Whether to watch the file with inotify (default: True)
+            delimiter: CSV field delimiter (default: ",")
+            header: Whether the first CSV row holds column names; rows are
+                then dicts instead of lists (default: True)
+            json_path: JSON path to extract from the parsed content
+            jq_expression: jq expression to extract from the parsed content
+            encoding: Text encoding of the file (default: utf-8)
+            **kwargs: Additional arguments passed to DataProvider
+        """
+        super().__init__(**kwargs)
+
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format '{format}'. Available: {list(FORMATS)}")
+        if format == "auto":
+            extension = os.path.splitext(path)[1].lower()
+            format = {".json": "json", ".csv": "csv", ".tsv": "csv"}.get(extension, "text")
+            if extension == ".tsv" and delimiter == ",":
+                delimiter = "\t"
+
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.format = format
+        self.watch = watch
+        self.delimiter = delimiter
+        self.header = header
+        self.encoding = encoding
+        self.extractor = get_extractor(json_path, jq_expression)
+
+        # Signature and content hash of the last file that was parsed
+        self.signature = None
+        self.content_hash = None
+        self._inotify = None
+
+    def start(self, runtime=None, delay=0):
+        if self.watch:
+            try:
+                self._inotify = Inotify()
+                self._inotify.add_watch(os.path.dirname(self.path))
+            except OSError as e:
+                self.logger.info(f"Not watching {self.path}, polling instead: {e}")
+                if self._inotify is not None:
+                    self._inotify.close()
+                    self._inotify = None
+
+        # A watcher blocks its thread, so only polling can use the runtime
+        super().start(runtime=None if self._inotify is not None else runtime, delay=delay)
+
+    def stop(self):
+        super().stop()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _fetch_loop(self):
+        if self._inotify is None:
+            super()._fetch_loop()
+            return
+
+        if self._stop_event.wait(timeout=self._start_delay):
+            return
+        self._perform_fetch()
+        while not self._stop_event.is_set():
+            deadline = time.monotonic() + self._next_interval()
+            changed = False
+            while not changed and not self._stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Check for stop requests at least once a second
+                changed = self.path in self._inotify.wait(min(remaining, 1.0))
+            if not self._stop_event.is_set():
+                self._perform_fetch()
+
+    def _fetch_data(self):
+        """Read and parse the file, unless it didn't change.
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If the content can't be parsed
+        """
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            have_data = self.get_data() is not None
+            if have_data and signature == self.signature:
+                return NOT_MODIFIED
+
+            if stat.st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    content_hash = hashlib.sha1(mapped).hexdigest()
+                    content = None if content_hash == self.content_hash else mapped[:]
+            else:
+                content = f.read()
+                content_hash = hashlib.sha1(content).hexdigest()
+
+        if have_data and content_hash == self.content_hash:
+            self.signature = signature
+            return NOT_MODIFIED
+        if content is None:
+            # Same content as before, but the data was dropped since
+            with open(self.path, "rb") as f:
+                content = f.read()
+
+        data = self._parse(content.decode(self.encoding))
+        if self.extractor is not None:
+            data = self.extractor.extract(data)
+        self.signature = signature
+        self.content_hash = content_hash
+        return data
+
+    def _parse(self, text):
+        if self.format == "json":
+            return json.loads(text)
+        if self.format == "csv":
+            rows = io.StringIO(text, newline="")
+            if self.header:
+                return list(csv.DictReader(rows, delimiter=self.delimiter))
+            return list(csv.reader(rows, delimiter=self.delimiter))
+        return text
@@ -0,0 +1,196 @@
+"""Time series of values extracted from a provider's data."""
+
+import bisect
+import logging
+import os
+import struct
+import threading
+import time
+from array import array
+
+from grydgets.json_utils import get_extractor
+
+# History files start with this header: magic, format version
+FILE_HEADER = struct.Struct("<4sI")
+FILE_MAGIC = b"GHST"
+FILE_VERSION = 1
+# Seconds between saves of the history file while running
+SAVE_INTERVAL = 300
+
+
+class ProviderHistory:
+    """Ring buffer of (timestamp, value) samples, stored in two arrays of doubles.
+
+    Samples are downsampled on the way in: all values falling in the same
+    resolution-second bucket are averaged into one sample, so the buffer
+    covers size * resolution seconds whatever the provider's update rate.
+
+    If a file is given, the history is loaded from it at construction and
+    saved to it every few minutes and when the provider stops.
+    """
+
+    def __init__(self, size=1440, resolution=60, json_path=None, jq_expression=None, file=None):
+        """Initialize the history.
+
+        Args:
+            size: Maximum number of samples kept (default: 1440)
+            resolution: Seconds covered by each sample (default: 60)
+            json_path: JSON path of the value in the provider's data
+            jq_expression: jq expression returning the value
+            file: Optional file to persist the history in
+        """
+        self.size = size
+        self.resolution = resolution
+        self.extractor = get_extractor(json_path, jq_expression)
+        self.file = file
+
+        self.lock = threading.Lock()
+        self.timestamps = array("d", bytes(8 * size))
+        self.values = array("d", bytes(8 * size))
+        # Index of the oldest sample, and number of samples stored
+        self.start = 0
+        self.count = 0
+        # Number of values averaged into the newest sample
+        self.bucket_count = 0
+        # Incremented whenever a sample is added or changed
+        self.version = 0
+        self.last_save = time.time()
+
+        self.logger = logging.getLogger("ProviderHistory")
+        if file is not None and os.path.exists(file):
+            try:
+                self.load()
+            except (OSError, ValueError, EOFError, struct.error) as e:
+                self.logger.warning(f"Could not load history from {file}: {e}")
+
+    def record(self, data, timestamp=None):
+        """Extract the value from a data snapshot and add it.
+
+        Data the value can't be extracted from, or that isn't a number, is
+        skipped.
+        """
+        try:
+            value = data if self.extractor is None else self.extractor.extract(data)
+            value = float(value)
+        except Exception as e:
+            self.logger.debug(f"Not recording value: {e}")
+            return
+        self.add(time.time() if timestamp is None else timestamp, value)
+
+        if self.file is not None and time.time() - self.last_save >= SAVE_INTERVAL:
+            self.save()
+
+    def add(self, timestamp, value):
+        with self.lock:
+            newest = (self.start + self.count - 1) % self.size
+            if (
+                self.count
+                and timestamp // self.resolution == self.timestamps[newest] // self.resolution
+            ):
+                # Same bucket: keep the running mean
+                old_value = self.values[newest]
+                self.bucket_count += 1
+                self.values[newest] = old_value + (value - old_value) / self.bucket_count
+                self.timestamps[newest] = timestamp
+                if self.values[newest] != old_value:
+                    self.version += 1
+                return
+
+            if self.count < self.size:
+                index = (self.start + self.count) % self.size
+                self.count += 1
+            else:
+                index = self.start
+                self.start = (self.start + 1) % self.size
+            self.timestamps[index] = timestamp
+            self.values[index] = value
+            self.bucket_count = 1
+            self.version += 1
+
+    def latest_timestamp(self):
+        """Return the timestamp of the newest sample, or None if there are none."""
+        with self.lock:
+            if not self.count:
+                return None
+            return self.timestamps[(self.start + self.count - 1) % self.size]
+
+    def get_series(self, since=None, points=None):
+        """Return the samples in chronological order.
+
+        Args:
+            since: Only return samples at or after this timestamp
+            points: Downsample to at most this many points, by averaging
+                consecutive samples
+
+        Returns:
+            (timestamps, values) tuple of lists.
+        """
+        with self.lock:
+            end = self.start + self.count
+            if end <= self.size:
+                timestamps = self.timestamps[self.start:end]
+                values = self.values[self.start:end]
+            else:
+                timestamps = self.timestamps[self.start:] + self.timestamps[:end - self.size]
+                values = self.values[self.start:] + self.values[:end - self.size]
+
+        if since is not None:
+            first = bisect.bisect_left(timestamps, since)
+            timestamps = timestamps[first:]
+            values = values[first:]
+
+        if points is None or len(values) <= points:
+            return list(timestamps), list(values)
+
+        step = len(values) / points
+        downsampled_timestamps = []
+        downsampled_values = []
+        for point in range(points):
+            first = int(point * step)
+            last = int((point + 1) * step)
+            downsampled_timestamps.append(timestamps[last - 1])
+            downsampled_values.append(sum(values[first:last]) / (last - first))
+        return downsampled_timestamps, downsampled_values
+
+    def save(self):
+        """Write the history to its file, replacing it atomically."""
+        if self.file is None:
+            return
+        timestamps, values = self.get_series()
+        directory = os.path.dirname(self.file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_file = f"{self.file}.tmp"
+        try:
+            with open(temporary_file, "wb") as f:
+                f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+                f.write(struct.pack("<I", len(values)))
+                array("d", timestamps).tofile(f)
+                array("d", values).tofile(f)
+            os.replace(temporary_file, self.file)
+        except OSError as e:
+            self.logger.warning(f"Could not save history to {self.file}: {e}")
+        self.last_save = time.time()
+
+    def load(self):
+        """Replace the samples with those saved in the history file."""
+        with open(self.file, "rb") as f:
+            magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != FILE_MAGIC or version != FILE_VERSION:
+                raise ValueError("not a history file")
+            (count,) = struct.unpack("<I", f.read(4))
+            timestamps = array("d")
+            values = array("d")
+            timestamps.fromfile(f, count)
+            values.fromfile(f, count)
+        if len(values) > self.size:
+            timestamps = timestamps[-self.size:]
+            values = values[-self.size:]
+
+        with self.lock:
+            self.start = 0
+            self.count = 0
+            self.bucket_count = 0
+        for timestamp, value in zip(timestamps, values):
+            self.add(timestamp, value)
+        self.logger.info(f"Loaded {self.count} samples from {self.file}")
@@ -4,7 +4,14 @@ import logging
 import os
 
 from grydgets.config import load_providers_config
+from grydgets.providers.cache import SnapshotCache
+from grydgets.providers.command import CommandDataProvider, command_runner
+from grydgets.providers.file import FileDataProvider
+from grydgets.providers.mqtt import MQTTDataProvider
+from grydgets.providers.recording import ProviderRecorder, ReplayDataProvider
 from grydgets.providers.rest import RestDataProvider
+from grydgets.providers.runtime import ProviderRuntime
+from grydgets.providers.stream import SSEDataProvider, WebSocketDataProvider
 
 
 class ProviderManager:
@@ -13,30 +20,72 @@ class ProviderManager:
     Responsibilities:
     - Load provider configuration from providers.yaml
     - Create provider instances
-    - Start/stop all providers
+    - Start/stop all providers, optionally on a shared runtime
+    - Apply configuration changes, keeping unchanged providers running
+    - Optionally record every fetched payload to a file
+    - Optionally cache the last good data of every provider across restarts
     - Provide lookup by name
     """
 
     # Map provider types to classes
     PROVIDER_TYPES = {
         'rest': RestDataProvider,
+        'replay': ReplayDataProvider,
+        'sse': SSEDataProvider,
+        'websocket': WebSocketDataProvider,
+        'mqtt': MQTTDataProvider,
+        'file': FileDataProvider,
+        'command': CommandDataProvider,
     }
 
-    def __init__(self, config_path='providers.yaml'):
+    def __init__(self, config_path='providers.yaml', record=True, previous=None):
         """Initialize the provider manager.
 
         Args:
             config_path: Path to providers configuration file (default: providers.yaml)
+            record: Whether to honour the `record` and `cache` settings, and
+                to write provider history files (default: True)
+            previous: Optional running ProviderManager being reloaded. Its
+                providers whose configuration is unchanged are reused,
+                running, and nothing of it is touched until take_over() is
+                called (or discard() to abandon the reload)
         """
         self.config_path = config_path
+        self.record = record
+        self.previous = previous
         self.providers = {}
+        # Configuration each provider was created from, and all other
+        # top-level settings, to tell what a reload changed
+        self.configs = {}
+        self.settings = {}
+        self.runtime = None
+        self.recorder = None
+        self.snapshot_cache = None
+        self.startup_stagger = 0.5
+        self.max_concurrent_commands = 2
+        # Names of providers whose data was restored from the snapshot cache
+        self.restored = set()
+        # Names of providers that are new, replaced or removed compared to
+        # the previous manager
+        self.changed = set()
         self.logger = logging.getLogger('ProviderManager')
 
         # Load and create providers
-        if os.path.exists(config_path):
-            self._load_providers()
-        else:
-            self.logger.info(f"No providers config found at {config_path}")
+        try:
+            if os.path.exists(config_path):
+                self._load_providers()
+            else:
+                self.logger.info(f"No providers config found at {config_path}")
+        except Exception:
+            self.discard()
+            raise
+
+        if previous is not None:
+            self.changed = {
+                name
+                for name in set(previous.providers) | set(self.providers)
+                if previous.providers.get(name) is not self.providers.get(name)
+            }
 
     def _load_providers(self):
         """Load provider configuration and create provider instances."""
@@ -50,21 +99,67 @@ class ProviderManager:
             self.logger.warning("No providers defined in config")
             return
 
+        settings = {key: value for key, value in config.items() if key != 'providers'}
+        previous = self.previous
+        # Manager whose running providers can be reused, if any
+        reusable = None
+        if previous is not None and settings == previous.settings:
+            reusable = previous
+            # Keep the runtime, recorder and cache the reused providers use
+            self.settings = previous.settings
+            self.runtime = previous.runtime
+            self.recorder = previous.recorder
+            self.snapshot_cache = previous.snapshot_cache
+            self.startup_stagger = previous.startup_stagger
+            self.max_concurrent_commands = previous.max_concurrent_commands
+        else:
+            if previous is not None:
+                self.logger.info("Provider settings changed, recreating all providers")
+            self._configure(config)
+
         providers_config = config['providers']
 
         for name, provider_config in providers_config.items():
             try:
-                self._create_provider(name, provider_config)
+                if reusable is not None and reusable.configs.get(name) == provider_config:
+                    self.providers[name] = reusable.providers[name]
+                else:
+                    old_provider = previous.providers.get(name) if previous is not None else None
+                    if old_provider is not None and old_provider.history is not None:
+                        # Let the replacement load the latest samples
+                        old_provider.history.save()
+                    self.providers[name] = self._create_provider(name, provider_config)
+                self.configs[name] = provider_config
             except Exception as e:
                 self.logger.error(f"Failed to create provider '{name}': {e}")
                 raise
 
+    def _configure(self, config):
+        """Set up what all providers share, from the top-level settings."""
+        self.settings = {key: value for key, value in config.items() if key != 'providers'}
+
+        runtime_config = config.get('runtime') or {}
+        if runtime_config.get('shared', False):
+            self.runtime = ProviderRuntime(
+                max_concurrent_fetches=runtime_config.get('max_concurrent_fetches', 4)
+            )
+        self.max_concurrent_commands = runtime_config.get('max_concurrent_commands', 2)
+        self.startup_stagger = runtime_config.get('startup_stagger', 0.5)
+
+        if self.record and config.get('record'):
+            self.recorder = ProviderRecorder(config['record'])
+        if self.record and config.get('cache'):
+            self.snapshot_cache = SnapshotCache(config['cache'])
+
     def _create_provider(self, name, config):
         """Create a single provider instance.
 
         Args:
             name: Provider name
             config: Provider configuration dictionary
+
+        Returns:
+            The new provider, not started yet.
         """
         if not isinstance(config, dict):
             raise ValueError(f"Provider '{name}' config must be a dictionary")
@@ -87,20 +182,108 @@ class ProviderManager:
 
         # Create provider instance
         provider = provider_class(**provider_kwargs)
-        self.providers[name] = provider
+        provider.recorder = self.recorder
+        if not self.record and provider.history is not None:
+            # Still load the saved history, but never overwrite it
+            provider.history.file = None
+        if self.snapshot_cache is not None:
+            if self.snapshot_cache.restore(provider, config):
+                self.restored.add(name)
+            provider.snapshot_cache = self.snapshot_cache
 
         self.logger.info(f"Created provider '{name}' of type '{provider_type}'")
+        return provider
 
     def start_all(self):
-        """Start all providers."""
+        """Start all providers.
+
+        Providers without data fetch right away. Providers restored from the
+        snapshot cache already have something to show, so their first
+        fetches are spread startup_stagger seconds apart instead of all
+        hitting the network at once.
+        """
         self.logger.info(f"Starting {len(self.providers)} providers")
-        for name, provider in self.providers.items():
+        if self.runtime is not None:
+            self.runtime.start()
+        command_runner.configure(max_processes=self.max_concurrent_commands)
+        self._start(self.providers)
+
+    def _start(self, providers):
+        restored = 0
+        for name, provider in providers.items():
+            delay = 0
+            if name in self.restored:
+                restored += 1
+                delay = restored * self.startup_stagger
             try:
-                provider.start()
+                provider.start(runtime=self.runtime, delay=delay)
             except Exception as e:
                 self.logger.error(f"Failed to start provider '{name}': {e}")
                 raise
 
+    def take_over(self):
+        """Replace the previous manager given at construction.
+
+        Providers reused from the previous manager keep running. New
+        providers are started, and only then are the previous manager's
+        other providers stopped (and its runtime, recorder and cache
+        closed, if they were replaced too).
+        """
+        previous = self.previous
+        self.previous = None
+        if previous is None:
+            self.start_all()
+            return
+
+        reused = {id(provider) for provider in previous.providers.values()}
+        new_providers = {
+            name: provider
+            for name, provider in self.providers.items()
+            if id(provider) not in reused
+        }
+        self.logger.info(
+            f"Taking over {len(self.providers) - len(new_providers)} providers, "
+            f"starting {len(new_providers)}"
+        )
+        if self.runtime is not None and self.runtime is not previous.runtime:
+            self.runtime.start()
+        command_runner.configure(max_processes=self.max_concurrent_commands)
+        self._start(new_providers)
+
+        kept = {id(provider) for provider in self.providers.values()}
+        for name, provider in previous.providers.items():
+            if id(provider) in kept:
+                continue
+            if provider.snapshot_cache is not None:
+                # Its configuration changed, so its snapshot is of no use
+                provider.snapshot_cache.discard(provider)
+            try:
+                provider.stop()
+            except Exception as e:
+                self.logger.warning(f"Error stopping provider '{name}': {e}")
+        if previous.runtime is not None and previous.runtime is not self.runtime:
+            previous.runtime.stop()
+        if previous.recorder is not None and previous.recorder is not self.recorder:
+            previous.recorder.close()
+        if (
+            previous.snapshot_cache is not None
+            and previous.snapshot_cache is not self.snapshot_cache
+        ):
+            previous.snapshot_cache.flush()
+
+    def discard(self):
+        """Abandon a reload, leaving the previous manager running as it was.
+
+        Only closes what this manager opened itself; none of its own
+        providers were started yet.
+        """
+        previous = self.previous
+        self.previous = None
+        if self.recorder is not None and (
+            previous is None or self.recorder is not previous.recorder
+        ):
+            self.recorder.close()
+
     def stop_all(self):
         """Stop all providers."""
         self.logger.info(f"Stopping {len(self.providers)} providers")
@@ -109,6 +292,12 @@ class ProviderManager:
                 provider.stop()
             except Exception as e:
                 self.logger.warning(f"Error stopping provider '{name}': {e}")
+        if self.runtime is not None:
+            self.runtime.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.snapshot_cache is not None:
+            self.snapshot_cache.flush()
 
     def get_provider(self, name):
         """Get a provider by name.
@@ -0,0 +1,146 @@
+"""MQTT subscriber data provider."""
+
+import time
+
+from grydgets.json_utils import get_extractor
+from grydgets.providers.stream import StreamDataProvider
+
+try:
+    import paho.mqtt.client as mqtt
+except ImportError:  # Optional, only needed by the mqtt provider
+    mqtt = None
+
+
+class MQTTDataProvider(StreamDataProvider):
+    """Data provider that subscribes to MQTT topics.
+
+    The data is a dict with the latest payload per topic, parsed as JSON if
+    possible. Messages arriving within coalesce seconds of each other are
+    applied together, so a burst of messages (e.g. retained messages right
+    after subscribing) updates the data, and redraws bound widgets, once.
+
+    Needs the optional paho-mqtt package.
+    """
+
+    def __init__(
+        self,
+        host,
+        topics,
+        port=1883,
+        username=None,
+        password=None,
+        client_id="",
+        qos=0,
+        tls=False,
+        keepalive=60,
+        coalesce=0.05,
+        json_path=None,
+        jq_expression=None,
+        **kwargs,
+    ):
+        """Initialize the MQTT provider.
+
+        Args:
+            host: Broker host name
+            topics: Topic or list of topics to subscribe to; may contain
+                the + and # wildcards
+            port: Broker port (default: 1883)
+            username: Optional user name
+            password: Optional password
+            client_id: Client id (default: generated by the broker)
+            qos: Subscription quality of service, 0 to 2 (default: 0)
+            tls: Whether to connect with TLS (default: False)
+            keepalive: Seconds between keepalive pings (default: 60)
+            coalesce: Seconds to collect messages before applying them
+                (default: 0.05)
+            json_path: JSON path to extract from each payload
+            jq_expression: jq expression to extract from each payload
+            **kwargs: Additional arguments passed to StreamDataProvider
+        """
+        if mqtt is None:
+            raise ImportError(
+                "The mqtt provider requires the paho-mqtt package "
+                "(pip install paho-mqtt)"
+            )
+        super().__init__(update="merge", **kwargs)
+        self.host = host
+        self.port = port
+        self.topics = [topics] if isinstance(topics, str) else list(topics)
+        self.username = username
+        self.password = password
+        self.client_id = client_id
+        self.qos = qos
+        self.tls = tls
+        self.keepalive = keepalive
+        self.coalesce = coalesce
+        self.payload_extractor = get_extractor(json_path, jq_expression)
+
+        # Latest payload per topic, not applied to the data yet
+        self._pending = {}
+        self._pending_since = None
+        self._connect_error = None
+
+    def _make_client(self):
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=self.client_id)
+        else:
+            client = mqtt.Client(client_id=self.client_id)
+        if self.username is not None:
+            client.username_pw_set(self.username, self.password)
+        if self.tls:
+            client.tls_set()
+        client.on_connect = self._on_connect
+        client.on_message = self._on_message
+        return client
+
+    def _on_connect(self, client, userdata, flags, reason_code, *args):
+        # reason_code is an int with paho-mqtt 1.x, a ReasonCode with 2.x
+        if getattr(reason_code, "is_failure", reason_code != 0):
+            self._connect_error = f"Connection refused: {reason_code}"
+            return
+        self.logger.info(f"Connected to {self.host}:{self.port}")
+        self._mark_connected()
+        client.subscribe([(topic, self.qos) for topic in self.topics])
+
+    def _on_message(self, client, userdata, message):
+        payload = self._decode(message.payload.decode("utf-8", errors="replace"))
+        if self.payload_extractor is not None:
+            try:
+                payload = self.payload_extractor.extract(payload)
+            except Exception as e:
+                self.logger.debug(f"Ignoring message on {message.topic}: {e}")
+                return
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending[message.topic] = payload
+
+    def _flush(self, force=False):
+        """Apply the collected messages, if they have waited long enough."""
+        if not self._pending:
+            return
+        if not force and time.monotonic() - self._pending_since < self.coalesce:
+            return
+        pending = self._pending
+        self._pending = {}
+        self._handle_message(pending)
+
+    def _stream(self):
+        client = self._make_client()
+        self._connect_error = None
+        client.connect(self.host, self.port, keepalive=self.keepalive)
+        try:
+            # Callbacks run on this thread, from within loop()
+            while not self._stop_event.is_set():
+                timeout = self.coalesce if self._pending else 1.0
+                result = client.loop(timeout=timeout)
+                if self._connect_error is not None:
+                    raise Exception(self._connect_error)
+                if result != mqtt.MQTT_ERR_SUCCESS:
+                    # Keep the merged data, non-retained topics won't be
+                    # sent again after reconnecting
+                    self._flush(force=True)
+                    self.logger.warning(f"Connection lost: {mqtt.error_string(result)}")
+                    return
+                self._flush()
+        finally:
+            client.disconnect()
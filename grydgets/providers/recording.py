@@ -0,0 +1,125 @@
+"""Recording of provider payloads, and the replay provider that plays them back."""
+
+import gzip
+import json
+import logging
+import threading
+import time
+
+from grydgets.providers.base import DataProvider, NOT_MODIFIED
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ProviderRecorder:
+    """Appends fetched provider payloads to a recording file.
+
+    The file has one compact JSON array per line, [unix timestamp, provider
+    name, payload], and is gzip-compressed if its name ends in .gz. Files
+    are appended to, so restarts and configuration reloads extend the same
+    recording.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = _open(path, "a")
+        self.logger = logging.getLogger("ProviderRecorder")
+        self.logger.info(f"Recording provider payloads to {path}")
+
+    def record(self, provider_name, data):
+        """Append a payload, if it can be serialized to JSON."""
+        try:
+            line = json.dumps(
+                [round(time.time(), 3), provider_name, data],
+                separators=(",", ":"),
+            )
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Not recording payload of '{provider_name}': {e}")
+            return
+
+        with self.lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_recording(path):
+    """Load a recording made by ProviderRecorder.
+
+    Returns:
+        Dict mapping provider name to a list of (timestamp, payload) tuples,
+        in recording order.
+    """
+    recording = {}
+    with _open(path, "r") as recording_file:
+        for line in recording_file:
+            if not line.strip():
+                continue
+            offset, provider_name, data = json.loads(line)
+            recording.setdefault(provider_name, []).append((offset, data))
+    return recording
+
+
+class ReplayDataProvider(DataProvider):
+    """Data provider that plays back payloads from a recording.
+
+    Payloads are served with the same spacing they were recorded with,
+    divided by speed. When the recording ends, playback either starts over
+    after update_interval seconds (scaled by speed too) or stops on the last
+    payload.
+    """
+
+    def __init__(self, file, source=None, speed=1, loop=True, **kwargs):
+        """Initialize the replay provider.
+
+        Args:
+            file: Recording file written with a provider `record` setting
+            source: Name of the recorded provider to play back (default: this
+                provider's own name)
+            speed: Playback speed factor, e.g. 10 for ten times faster (default: 1)
+            loop: Whether to start over when the recording ends (default: True)
+            **kwargs: Additional arguments passed to DataProvider
+        """
+        super().__init__(**kwargs)
+        self.file = file
+        self.source = source or self.name
+        self.speed = float(speed)
+        self.loop = loop
+
+        entries = load_recording(file).get(self.source)
+        if not entries:
+            raise ValueError(f"No payloads for '{self.source}' in recording {file}")
+        self.entries = entries
+        self.position = 0
+
+    def _next_interval(self):
+        if self.position == 0:
+            return 0
+        if self.position < len(self.entries):
+            delay = self.entries[self.position][0] - self.entries[self.position - 1][0]
+        elif self.loop:
+            delay = self.update_interval
+        else:
+            return self.update_interval
+        return max(delay, 0) / self.speed
+
+    def _fetch_data(self):
+        if self.position >= len(self.entries):
+            if not self.loop:
+                return NOT_MODIFIED
+            self.position = 0
+
+        _, data = self.entries[self.position]
+        self.position += 1
+        return data
@@ -1,10 +1,38 @@
 """REST API data provider."""
 
 import base64
-import requests
+import hashlib
 
-from grydgets.providers.base import DataProvider
-from grydgets.json_utils import extract_data
+from grydgets.http_client import http_client
+from grydgets.providers.base import DataProvider, NOT_MODIFIED
+from grydgets.json_utils import get_extractor
+
+
+def auth_header(auth):
+    """Return the Authorization header value for a provider auth setting.
+
+    Args:
+        auth: Authentication dict with 'type' and credentials, or None
+
+    Returns:
+        Header value string, or None if no authentication is configured.
+    """
+    if auth is None:
+        return None
+    if "bearer" in auth:
+        return f"Bearer {auth['bearer']}"
+    if "basic" in auth:
+        username = auth["basic"].get("username", "")
+        password = auth["basic"].get("password", "")
+    elif auth.get("type") == "bearer" and "token" in auth:
+        return f"Bearer {auth['token']}"
+    elif auth.get("type") == "basic":
+        username = auth.get("username", "")
+        password = auth.get("password", "")
+    else:
+        return None
+    auth_string = f"{username}:{password}"
+    return f"Basic {base64.b64encode(auth_string.encode()).decode()}"
 
 
 class RestDataProvider(DataProvider):
@@ -16,8 +44,14 @@ class RestDataProvider(DataProvider):
     - Custom headers and query parameters
     - JSON path extraction
     - Jitter for update intervals
+
+    GET requests are sent with If-None-Match/If-Modified-Since when the
+    server provided an ETag or Last-Modified header, and a response whose
+    body is byte-identical to the previous one is treated as unchanged.
     """
 
+    SNAPSHOT_VALIDATORS = ("etag", "last_modified", "content_hash")
+
     def __init__(
         self,
         url,
@@ -54,6 +88,7 @@ class RestDataProvider(DataProvider):
         self.body = body or payload
         self.json_path = json_path
         self.jq_expression = jq_expression
+        self.extractor = get_extractor(json_path, jq_expression)
 
         # Build request kwargs
         self.requests_kwargs = {
@@ -62,47 +97,70 @@ class RestDataProvider(DataProvider):
         }
 
         # Configure authentication
-        if auth is not None:
-            if "bearer" in auth:
-                self.requests_kwargs["headers"]["Authorization"] = f"Bearer {auth['bearer']}"
-            elif "basic" in auth:
-                username = auth["basic"].get("username", "")
-                password = auth["basic"].get("password", "")
-                auth_string = f"{username}:{password}"
-                encoded_auth = base64.b64encode(auth_string.encode()).decode()
-                self.requests_kwargs["headers"]["Authorization"] = f"Basic {encoded_auth}"
-            elif auth.get("type") == "bearer" and "token" in auth:
-                self.requests_kwargs["headers"]["Authorization"] = f"Bearer {auth['token']}"
-            elif auth.get("type") == "basic":
-                username = auth.get("username", "")
-                password = auth.get("password", "")
-                auth_string = f"{username}:{password}"
-                encoded_auth = base64.b64encode(auth_string.encode()).decode()
-                self.requests_kwargs["headers"]["Authorization"] = f"Basic {encoded_auth}"
+        authorization = auth_header(auth)
+        if authorization is not None:
+            self.requests_kwargs["headers"]["Authorization"] = authorization
 
         # Add body for POST/PUT requests
         if self.method in ("POST", "PUT") and self.body:
             self.requests_kwargs["json"] = self.body
 
+        # Validators from the last successful response
+        self.etag = None
+        self.last_modified = None
+        self.content_hash = None
+
     def _fetch_data(self):
         """Fetch data from the REST API.
 
         Returns:
-            The fetched data, optionally extracted via json_path and/or jq_expression.
+            The fetched data, optionally extracted via json_path and/or jq_expression,
+            or NOT_MODIFIED if the response is unchanged since the last fetch.
 
         Raises:
             requests.RequestException: If the HTTP request fails
             Exception: If JSON extraction fails
         """
-        response = requests.request(
-            method=self.method,
+        # Only revalidate if we still have the data the validators refer to
+        have_data = self.get_data() is not None
+
+        requests_kwargs = self.requests_kwargs
+        if have_data and self.method == "GET":
+            conditional_headers = {}
+            if self.etag:
+                conditional_headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                conditional_headers["If-Modified-Since"] = self.last_modified
+            if conditional_headers:
+                requests_kwargs = dict(self.requests_kwargs)
+                requests_kwargs["headers"] = {
+                    **self.requests_kwargs["headers"],
+                    **conditional_headers,
+                }
+
+        response = http_client.fetch(
+            self.method,
             url=self.url,
-            **self.requests_kwargs
+            **requests_kwargs
         )
 
+        if response.status_code == 304 and have_data:
+            return NOT_MODIFIED
+
         if response.status_code != 200:
             raise Exception(f"HTTP {response.status_code}: {response.text}")
 
+        # Validators are only stored once the body they describe was parsed
+        # and extracted, so a bad body is fetched and parsed again next time
+        # instead of being confirmed by a 304 or an identical hash
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        content_hash = hashlib.sha1(response.content).hexdigest()
+        if have_data and content_hash == self.content_hash:
+            self.etag = etag
+            self.last_modified = last_modified
+            return NOT_MODIFIED
+
         # Parse JSON response
         try:
             data = response.json()
@@ -110,14 +168,13 @@ class RestDataProvider(DataProvider):
             raise Exception(f"Invalid JSON response: {e}")
 
         # Extract data if json_path or jq_expression specified
-        if self.json_path or self.jq_expression:
+        if self.extractor is not None:
             try:
-                data = extract_data(
-                    data,
-                    json_path=self.json_path,
-                    jq_expression=self.jq_expression
-                )
+                data = self.extractor.extract(data)
             except Exception as e:
                 raise Exception(f"Data extraction failed: {e}")
 
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
         return data
@@ -0,0 +1,121 @@
+"""Shared fetch runtime for data providers."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ProviderRuntime:
+    """Schedules fetches for many providers from a single thread.
+
+    Instead of each provider sleeping in its own thread, providers are kept
+    in a priority queue keyed on the time their next fetch is due. A single
+    scheduler thread pops due providers and hands them to a bounded worker
+    pool, which caps how many fetches can run at the same time.
+    """
+
+    def __init__(self, max_concurrent_fetches=4):
+        """Initialize the runtime.
+
+        Args:
+            max_concurrent_fetches: Maximum number of fetches running at once (default: 4)
+        """
+        self.max_concurrent_fetches = max_concurrent_fetches
+
+        self._condition = threading.Condition()
+        self._queue = []
+        self._counter = itertools.count()
+        self._providers = set()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._executor = None
+
+        self.logger = logging.getLogger('ProviderRuntime')
+
+    def start(self):
+        """Start the scheduler thread and worker pool."""
+        if self._thread is not None:
+            self.logger.warning("Runtime already started")
+            return
+
+        self.logger.info(
+            f"Starting shared runtime with {self.max_concurrent_fetches} workers"
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_fetches,
+            thread_name_prefix='provider-fetch',
+        )
+        self._thread = threading.Thread(target=self._schedule_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop scheduling fetches and shut down the worker pool."""
+        self.logger.info("Stopping shared runtime")
+        self._stop_event.set()
+        with self._condition:
+            self._providers.clear()
+            self._queue.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def add(self, provider, due=None):
+        """Register a provider and schedule its first fetch.
+
+        Args:
+            provider: DataProvider instance
+            due: Unix timestamp of the first fetch (default: now)
+        """
+        with self._condition:
+            self._providers.add(provider)
+            self._push(provider, time.time() if due is None else due)
+
+    def remove(self, provider):
+        """Unregister a provider. A fetch already in progress is allowed to finish."""
+        with self._condition:
+            self._providers.discard(provider)
+
+    def _push(self, provider, due):
+        heapq.heappush(self._queue, (due, next(self._counter), provider))
+        self._condition.notify_all()
+
+    def _schedule_loop(self):
+        """Pop providers from the queue as they become due and submit their fetch."""
+        while not self._stop_event.is_set():
+            with self._condition:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                due, _, provider = self._queue[0]
+                timeout = due - time.time()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+
+                heapq.heappop(self._queue)
+                if provider not in self._providers:
+                    continue
+
+            try:
+                self._executor.submit(self._fetch, provider)
+            except RuntimeError:
+                # Executor was shut down while we were scheduling
+                break
+
+    def _fetch(self, provider):
+        """Run a single fetch on a worker thread and schedule the next one."""
+        try:
+            provider._perform_fetch()
+        finally:
+            with self._condition:
+                if provider in self._providers:
+                    self._push(provider, time.time() + provider._next_interval())
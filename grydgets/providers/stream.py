@@ -0,0 +1,350 @@
+"""Push-based data providers that hold a WebSocket or Server-Sent Events stream."""
+
+import json
+import socket
+
+from grydgets.http_client import http_client
+from grydgets.json_utils import get_extractor
+from grydgets.providers.base import DataProvider
+from grydgets.providers.rest import auth_header
+
+try:
+    import websocket
+except ImportError:  # Optional, only needed by the websocket provider
+    websocket = None
+
+UPDATE_MODES = ("replace", "merge", "keyed")
+
+
+class StreamDataProvider(DataProvider):
+    """Base class for providers that receive messages over a persistent stream.
+
+    Every message is optionally narrowed down by json_path/jq_expression and
+    then applied to the snapshot according to update:
+
+    - replace: the message becomes the new snapshot
+    - merge: the message (a dict) is merged into the snapshot
+    - keyed: the snapshot is a dict of the latest message per key, where
+      the key is extracted from each message with the key json path
+
+    Messages that don't change the snapshot, or that the extraction fails
+    on, are ignored, so the timestamp only advances on actual changes.
+
+    Streams always run on their own thread, even with a shared runtime.
+    When an open connection drops or goes idle for idle_timeout seconds, it
+    is reopened after update_interval seconds and the snapshot is kept, as
+    it is still the latest known state. Only failing to connect counts as a
+    failed fetch, with the usual backoff and stale_ttl.
+    """
+
+    def __init__(
+        self,
+        json_path=None,
+        jq_expression=None,
+        update="replace",
+        key=None,
+        idle_timeout=300,
+        update_interval=5,
+        **kwargs,
+    ):
+        """Initialize the stream provider.
+
+        Args:
+            json_path: JSON path to extract from each message
+            jq_expression: jq expression to extract from each message
+            update: How messages are applied to the snapshot: replace, merge
+                or keyed (default: replace)
+            key: JSON path of the key in each message, for update: keyed
+            idle_timeout: Seconds without any traffic after which the
+                connection is considered dead, or 0 to wait forever
+                (default: 300)
+            update_interval: Seconds to wait before reconnecting (default: 5)
+            **kwargs: Additional arguments passed to DataProvider
+        """
+        super().__init__(update_interval=update_interval, **kwargs)
+
+        if update not in UPDATE_MODES:
+            raise ValueError(
+                f"Unknown update mode '{update}'. Available: {list(UPDATE_MODES)}"
+            )
+        if update == "keyed" and not key:
+            raise ValueError("update: keyed requires a key json path")
+
+        self.update = update
+        self.extractor = get_extractor(json_path, jq_expression)
+        self.key_extractor = get_extractor(json_path=key) if key else None
+        self.idle_timeout = idle_timeout or None
+        # Whether the current _stream() call got connected
+        self._connected = False
+
+    def start(self, runtime=None, delay=0):
+        # A stream blocks its thread for as long as it is open, so it can't
+        # be scheduled on the shared runtime's worker pool
+        super().start(delay=delay)
+
+    def stop(self):
+        self._stop_event.set()
+        self._disconnect()
+        super().stop()
+
+    def _fetch_loop(self):
+        """Keep the stream open until the provider is stopped."""
+        if self._stop_event.wait(timeout=self._start_delay):
+            return
+        while not self._stop_event.is_set():
+            self._connected = False
+            try:
+                self._stream()
+                if not self._stop_event.is_set():
+                    self.logger.info("Stream closed, reconnecting")
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                if self._connected:
+                    self.logger.warning(f"Stream lost, reconnecting: {e}")
+                else:
+                    self._handle_failure(e)
+
+            if self._stop_event.wait(timeout=self._next_interval()):
+                break
+
+    def _stream(self):
+        """Open the stream and pass every message to _handle_message().
+
+        Must call _mark_connected() once connected, and return or raise
+        when the stream ends. This method must be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses must implement _stream()")
+
+    def _mark_connected(self):
+        """Record that the stream is open, so losing it isn't a failure."""
+        self._connected = True
+        self._reset_failures()
+
+    def _disconnect(self):
+        """Close the open stream, if any, from another thread."""
+
+    def _handle_message(self, message):
+        """Apply a message to the snapshot, publishing it if it changed."""
+        try:
+            if self.extractor is not None:
+                message = self.extractor.extract(message)
+            if self.key_extractor is not None:
+                key = self.key_extractor.extract(message)
+        except Exception as e:
+            self.logger.debug(f"Ignoring message: {e}")
+            return
+
+        snapshot = self.get_data()
+        if self.update == "replace":
+            if message == snapshot:
+                return
+            snapshot = message
+        elif self.update == "merge":
+            if not isinstance(message, dict):
+                self.logger.debug("Ignoring message that isn't an object")
+                return
+            snapshot = snapshot or {}
+            if all(key in snapshot and snapshot[key] == value for key, value in message.items()):
+                return
+            snapshot = {**snapshot, **message}
+        else:
+            snapshot = snapshot or {}
+            if key in snapshot and snapshot[key] == message:
+                return
+            snapshot = {**snapshot, key: message}
+
+        self._publish(snapshot)
+
+    def _decode(self, text):
+        """Parse a message as JSON, falling back to the raw text."""
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+
+def parse_sse(lines):
+    """Parse Server-Sent Events from an iterable of decoded lines.
+
+    Yields:
+        (event type, data, last event id) tuples, one per dispatched event.
+    """
+    event_type = ""
+    data = []
+    last_id = None
+    for line in lines:
+        if not line:
+            if data:
+                yield event_type or "message", "\n".join(data), last_id
+            event_type = ""
+            data = []
+            continue
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            data.append(value)
+        elif field == "event":
+            event_type = value
+        elif field == "id" and "\0" not in value:
+            last_id = value
+
+
+class SSEDataProvider(StreamDataProvider):
+    """Data provider that listens to a Server-Sent Events stream.
+
+    Reconnects send Last-Event-ID, so servers that support it resume the
+    stream where it left off.
+    """
+
+    def __init__(self, url, headers=None, params=None, auth=None, events=None, **kwargs):
+        """Initialize the SSE provider.
+
+        Args:
+            url: The event stream URL
+            headers: Dictionary of HTTP headers
+            params: Dictionary of query parameters
+            auth: Authentication dict with 'type' and credentials
+            events: Event type or list of event types to listen to
+                (default: all events)
+            **kwargs: Additional arguments passed to StreamDataProvider
+        """
+        super().__init__(**kwargs)
+        self.url = url
+        # Lines are read from the raw response, which isn't decompressed
+        self.headers = {
+            **(headers or {}),
+            "Accept": "text/event-stream",
+            "Accept-Encoding": "identity",
+        }
+        authorization = auth_header(auth)
+        if authorization is not None:
+            self.headers["Authorization"] = authorization
+        self.params = params or {}
+        if isinstance(events, str):
+            events = [events]
+        self.events = set(events) if events else None
+
+        self.last_event_id = None
+        self._response = None
+
+    def _stream(self):
+        headers = dict(self.headers)
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+
+        response = http_client.request(
+            "GET",
+            self.url,
+            headers=headers,
+            params=self.params,
+            stream=True,
+            timeout=(http_client.timeout, self.idle_timeout),
+        )
+        self._response = response
+        try:
+            if response.status_code != 200:
+                raise Exception(f"HTTP {response.status_code}: {response.reason}")
+            self.logger.info("Event stream connected")
+            self._mark_connected()
+
+            for event_type, data, last_id in parse_sse(self._read_lines(response)):
+                self.last_event_id = last_id
+                if self.events is None or event_type in self.events:
+                    self._handle_message(self._decode(data))
+        finally:
+            self._response = None
+            response.close()
+
+    def _read_lines(self, response):
+        """Yield lines as soon as they arrive, without waiting for a full chunk."""
+        buffer = b""
+        while True:
+            chunk = response.raw.read1(65536)
+            if not chunk:
+                return
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+    def _disconnect(self):
+        # Closing the response would wait for the blocked read to finish,
+        # shutting the socket down makes the read return right away
+        response = self._response
+        connection = getattr(response.raw, "connection", None) if response else None
+        if connection is not None and connection.sock is not None:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class WebSocketDataProvider(StreamDataProvider):
+    """Data provider that listens to a WebSocket.
+
+    Needs the optional websocket-client package. Messages in send are sent
+    in order right after connecting, e.g. to authenticate and subscribe.
+    """
+
+    def __init__(self, url, headers=None, auth=None, send=None, **kwargs):
+        """Initialize the WebSocket provider.
+
+        Args:
+            url: The ws:// or wss:// URL
+            headers: Dictionary of HTTP headers for the handshake
+            auth: Authentication dict with 'type' and credentials
+            send: List of messages to send after connecting; dicts and lists
+                are sent as JSON
+            **kwargs: Additional arguments passed to StreamDataProvider
+        """
+        if websocket is None:
+            raise ImportError(
+                "The websocket provider requires the websocket-client package "
+                "(pip install websocket-client)"
+            )
+        super().__init__(**kwargs)
+        self.url = url
+        self.headers = dict(headers or {})
+        authorization = auth_header(auth)
+        if authorization is not None:
+            self.headers["Authorization"] = authorization
+        self.send = [
+            message if isinstance(message, str) else json.dumps(message)
+            for message in send or []
+        ]
+
+        self._connection = None
+
+    def _stream(self):
+        connection = websocket.create_connection(
+            self.url,
+            header=[f"{name}: {value}" for name, value in self.headers.items()],
+            timeout=self.idle_timeout,
+        )
+        self._connection = connection
+        try:
+            self.logger.info("WebSocket connected")
+            self._mark_connected()
+            for message in self.send:
+                connection.send(message)
+
+            while not self._stop_event.is_set():
+                message = connection.recv()
+                if not message:
+                    return
+                if isinstance(message, bytes):
+                    message = message.decode("utf-8", errors="replace")
+                self._handle_message(self._decode(message))
+        finally:
+            self._connection = None
+            connection.close(timeout=1)
+
+    def _disconnect(self):
+        connection = self._connection
+        if connection is not None:
+            connection.abort()
@@ -0,0 +1,66 @@
+"""Wake-up scheduling for the main render loop.
+
+The render loop sleeps until either the earliest deadline declared by the
+widget tree and outputs is reached, or something running in another thread
+(a provider fetch, a widget updater, a notification) signals that the screen
+may have changed.
+"""
+
+import threading
+import time
+
+
+def earliest(*deadlines):
+    """Return the earliest of the given deadlines, ignoring None values.
+
+    Returns:
+        The smallest deadline, or None if no deadline was given.
+    """
+    deadlines = [deadline for deadline in deadlines if deadline is not None]
+    if not deadlines:
+        return None
+    return min(deadlines)
+
+
+def next_minute():
+    """Return the timestamp of the next wall-clock minute boundary."""
+    return (int(time.time()) // 60 + 1) * 60
+
+
+class RenderScheduler:
+    """Lets background threads wake up the main loop while it is idle."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._woken = False
+
+    def wake(self):
+        """Signal that something changed and the main loop should run."""
+        with self._condition:
+            self._woken = True
+            self._condition.notify_all()
+
+    def clear(self):
+        """Forget pending wake-ups. Called right before the loop inspects the widget tree."""
+        with self._condition:
+            self._woken = False
+
+    def wait_until(self, deadline):
+        """Block until the deadline passes or wake() is called.
+
+        Args:
+            deadline: Unix timestamp to wait until
+
+        Returns:
+            True if woken up by wake(), False if the deadline passed.
+        """
+        with self._condition:
+            while not self._woken:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    return False
+                self._condition.wait(timeout)
+            return True
+
+
+scheduler = RenderScheduler()
@@ -6,8 +6,16 @@ import threading
 import time
 from typing import Any
 
+import pygame
+
+from grydgets.scheduler import earliest, scheduler
+
 
 class Widget(object):
+    # While set, widgets make no network requests and keep showing what
+    # they have instead (used by the bench)
+    offline = False
+
     def __init__(self, size: tuple[int, int] | None = None, name: str | None = None, **kwargs: Any) -> None:
         self.size: tuple[int, int] = size if size is not None else (0, 0)
         self.dirty = True
@@ -23,11 +31,29 @@ class Widget(object):
     def tick(self) -> None:
         pass
 
+    def next_deadline(self) -> float | None:
+        """Return the time at which this widget next needs a tick, if any.
+
+        Widgets that only change in response to external events (provider
+        updates, notifications, updater threads) return None and rely on
+        those events waking up the main loop instead.
+        """
+        return None
+
     def render(self, size: tuple[int, int]) -> Any:
         if self.size != size:
             self.size = size
             self.dirty = True
 
+    def get_damage(self) -> list[pygame.Rect]:
+        """Return the areas that changed during the last call to render().
+
+        Rects are in the widget's own coordinates. The default assumes the
+        whole surface changed; containers override this to report only the
+        cells they actually redrew.
+        """
+        return [pygame.Rect((0, 0), self.size)]
+
 
 class ContainerWidget(Widget):
     def __init__(self, size: tuple[int, int] | None = None, **kwargs: Any) -> None:
@@ -40,10 +66,21 @@ class ContainerWidget(Widget):
     def add_widget(self, widget: Widget) -> None:
         self.widget_list.append(widget)
 
+    def replace_widget(self, index: int, widget: Widget) -> None:
+        """Replace a child, e.g. after a configuration reload.
+
+        Containers that also keep their children elsewhere, such as in an
+        inner layout widget, must override this to replace them there too.
+        """
+        self.widget_list[index] = widget
+
     def tick(self) -> None:
         for widget in self.widget_list:
             widget.tick()
 
+    def next_deadline(self) -> float | None:
+        return earliest(*(widget.next_deadline() for widget in self.widget_list))
+
 
 class UpdaterWidget(Widget):
     def __init__(self, update_frequency: int = 30, static: bool = False, **kwargs: Any) -> None:
@@ -52,6 +89,9 @@ class UpdaterWidget(Widget):
         self.static = static
         self.update_thread = WidgetUpdaterThread(self, self.update_frequency, **kwargs)
 
+        if Widget.offline:
+            # Keep showing the initial state
+            return
         self.update()
         if not self.static:
             self.update_thread.start()
@@ -95,6 +135,7 @@ class WidgetUpdaterThread(threading.Thread):
                         break
                     self.logger.debug("Updating")
                     self.widget.update()
+                    scheduler.wake()
                 self._stop_event.wait(1)
         except Exception as e:
             self.logger.warning(str(e))
@@ -4,13 +4,10 @@ from typing import Any
 
 import pygame
 
-from grydgets.fonts import FontCache
-from grydgets.json_utils import extract_data
+from grydgets.fonts import font_cache, text_cache
 from grydgets.providers.base import DataProvider
 from grydgets.widgets.base import Widget
 
-font_cache = FontCache()
-
 
 class ProviderBarChartWidget(Widget):
     def __init__(
@@ -47,6 +44,7 @@ class ProviderBarChartWidget(Widget):
         self.provider = list(providers.values())[0]
         self.data_path = data_path
         self.jq_expression = jq_expression
+        self.extractor = self.provider.register_extraction(data_path, jq_expression)
         self.bar_color = tuple(bar_color)
         self.bar_colors: dict[str, tuple[int, ...]] = (
             {k: tuple(v) for k, v in bar_colors.items()} if bar_colors else {}
@@ -74,6 +72,9 @@ class ProviderBarChartWidget(Widget):
         self.quartline_color = tuple(quartline_color)
         self.labels_jq_expression = labels_jq_expression
         self.labels_data_path = labels_data_path
+        self.labels_extractor = self.provider.register_extraction(
+            labels_data_path, labels_jq_expression
+        )
         self.label_font_path = label_font_path
         self.label_size = label_size
         self.label_color = tuple(label_color)
@@ -86,15 +87,8 @@ class ProviderBarChartWidget(Widget):
             return True
         return self.dirty
 
-    def _extract_values(self, data: Any) -> list[float]:
-        if self.data_path or self.jq_expression:
-            result = extract_data(
-                data,
-                json_path=self.data_path,
-                jq_expression=self.jq_expression,
-            )
-        else:
-            result = data
+    def _extract_values(self) -> list[float]:
+        result = self.provider.get_extracted(self.extractor)
 
         if not isinstance(result, list):
             result = [result]
@@ -108,14 +102,10 @@ class ProviderBarChartWidget(Widget):
                 return threshold["color"]
         return self.bar_color
 
-    def _extract_labels(self, data: Any) -> list[str] | None:
-        if not self.labels_jq_expression and not self.labels_data_path:
+    def _extract_labels(self) -> list[str] | None:
+        if self.labels_extractor is None:
             return None
-        result = extract_data(
-            data,
-            json_path=self.labels_data_path,
-            jq_expression=self.labels_jq_expression,
-        )
+        result = self.provider.get_extracted(self.labels_extractor)
         if not isinstance(result, list):
             result = [result]
         return [str(v) for v in result]
@@ -141,8 +131,8 @@ class ProviderBarChartWidget(Widget):
             return self.surface
 
         try:
-            values = self._extract_values(data)
-            labels = self._extract_labels(data)
+            values = self._extract_values()
+            labels = self._extract_labels()
         except (KeyError, IndexError, ValueError, TypeError, StopIteration) as e:
             self.logger.debug(f"Failed to extract chart data: {e}")
             if self.surface is None:
@@ -221,10 +211,130 @@ class ProviderBarChartWidget(Widget):
                 )
 
             if has_labels and font is not None and labels is not None and i < len(labels):
-                label_surface = font.render(labels[i], True, self.label_color)
+                label_surface = text_cache.render(
+                    self.label_font_path, self.label_size, labels[i], self.label_color
+                )
                 label_x = x + (w - label_surface.get_width()) // 2
                 label_y = chart_height + 2
                 self.surface.blit(label_surface, (label_x, label_y))
 
         self.dirty = False
         return self.surface
+
+
+class ProviderLineChartWidget(Widget):
+    """Line chart, or sparkline, of a provider's history.
+
+    The provider must have a `history` setting. The chart ends at the newest
+    sample and covers span seconds, or the whole history.
+    """
+
+    def __init__(
+        self,
+        providers: dict[str, DataProvider],
+        span: float | None = None,
+        line_color: tuple[int, ...] = (100, 149, 237),
+        line_width: int = 2,
+        fill_color: tuple[int, ...] | None = None,
+        max_value: float | None = None,
+        min_value: float | None = None,
+        midline: bool = False,
+        midline_thickness: int = 1,
+        midline_color: tuple[int, ...] = (255, 255, 255),
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if not providers or len(providers) != 1:
+            raise ValueError("ProviderLineChartWidget requires exactly one provider")
+
+        self.providers = providers
+        self.provider = list(providers.values())[0]
+        if self.provider.history is None:
+            raise ValueError(
+                f"Provider '{self.provider.name}' has no history configured"
+            )
+        self.history = self.provider.history
+        self.span = span
+        self.line_color = tuple(line_color)
+        self.line_width = line_width
+        self.fill_color = tuple(fill_color) if fill_color is not None else None
+        self.max_value = max_value
+        self.min_value = min_value
+        self.midline = midline
+        self.midline_thickness = midline_thickness
+        self.midline_color = tuple(midline_color)
+
+        self.last_seen_version = -1
+        self.surface: pygame.Surface | None = None
+
+    def is_dirty(self) -> bool:
+        return self.dirty or self.history.version != self.last_seen_version
+
+    def _points(self, size: tuple[int, int]) -> list[tuple[int, int]]:
+        """Return the chart's points in pixels, one per pixel column at most."""
+        width, height = size
+        if width < 2 or height < 2:
+            return []
+
+        since = None
+        latest = self.history.latest_timestamp()
+        if self.span is not None and latest is not None:
+            since = latest - self.span
+        timestamps, values = self.history.get_series(since=since, points=width)
+        if not values:
+            return []
+
+        max_val = self.max_value if self.max_value is not None else max(values)
+        min_val = self.min_value if self.min_value is not None else min(values)
+        val_range = max_val - min_val
+        if val_range <= 0:
+            val_range = 1
+
+        end = timestamps[-1]
+        start = end - self.span if self.span is not None else timestamps[0]
+        time_range = end - start
+        margin = self.line_width // 2
+        usable_height = height - 1 - 2 * margin
+
+        points = []
+        for timestamp, value in zip(timestamps, values):
+            clamped = max(min_val, min(value, max_val))
+            x = (timestamp - start) / time_range * (width - 1) if time_range > 0 else width - 1
+            y = margin + usable_height - (clamped - min_val) / val_range * usable_height
+            points.append((round(x), round(y)))
+        return points
+
+    def render(self, size: tuple[int, int]) -> pygame.Surface:
+        super().render(size)  # updates self.size, may set self.dirty if size changed
+
+        version = self.history.version
+        if not self.dirty and version == self.last_seen_version and self.surface is not None:
+            return self.surface
+        self.last_seen_version = version
+
+        self.surface = pygame.Surface(size, pygame.SRCALPHA, 32)
+        width, height = size
+
+        if self.midline:
+            mid_y = height // 2 - self.midline_thickness // 2
+            pygame.draw.rect(
+                self.surface,
+                self.midline_color,
+                pygame.Rect(0, mid_y, width, self.midline_thickness),
+            )
+
+        points = self._points(size)
+        if len(points) == 1:
+            points = [(0, points[0][1]), points[0]]
+        if points:
+            if self.fill_color is not None:
+                pygame.draw.polygon(
+                    self.surface,
+                    self.fill_color,
+                    points + [(points[-1][0], height), (points[0][0], height)],
+                )
+            pygame.draw.lines(self.surface, self.line_color, False, points, self.line_width)
+
+        self.dirty = False
+        return self.surface
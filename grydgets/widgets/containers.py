@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import base64
 import itertools
-import logging
 import time
 from collections.abc import Sequence
 from datetime import datetime, time as datetime_time
@@ -12,8 +11,9 @@ from typing import Any
 import pygame
 import requests
 
-from grydgets.benchmark import benchmark
-from grydgets.json_utils import extract_data
+from grydgets.http_client import http_client
+from grydgets.json_utils import get_extractor
+from grydgets.scheduler import earliest, next_minute
 from grydgets.widgets.base import ContainerWidget, WidgetUpdaterThread, UpdaterWidget, Widget
 
 
@@ -36,6 +36,115 @@ def load_and_scale_image(image_path: str, size: tuple[int, int]) -> pygame.Surfa
     return scaled_image
 
 
+class DropShadow:
+    """Blurred shadow cast by the opaque pixels of a surface.
+
+    The shadow only depends on which pixels are (mostly) opaque, so it is
+    cached along with the mask it was computed from. When the content
+    changes, only the area around pixels whose opacity changed is blurred
+    again, and a change that leaves the mask alone costs nothing but a mask
+    comparison.
+
+    The shadow surface is larger than the content by spread pixels on each
+    side, so the content's origin sits at (spread, spread) on it.
+    """
+
+    def __init__(
+        self,
+        blur: Any = pygame.transform.gaussian_blur,
+        radius: int = 5,
+        spread: int | None = None,
+        strength: int = 1,
+    ) -> None:
+        """Initialize the shadow.
+
+        Args:
+            blur: pygame.transform blur function
+            radius: Blur radius
+            spread: How far the blur reaches from the content (default: twice
+                the radius, which covers the tails of a gaussian blur)
+            strength: How many times the shadow is layered over itself
+        """
+        self.blur = blur
+        self.radius = radius
+        self.spread = spread if spread is not None else radius * 2
+        self.strength = strength
+        self.mask: pygame.mask.Mask | None = None
+        self.surface: pygame.Surface | None = None
+
+    def update(self, content: pygame.Surface) -> list[pygame.Rect]:
+        """Bring the shadow up to date with content.
+
+        Returns:
+            Rects where the shadow changed, in content coordinates. They can
+            extend up to spread pixels outside the content.
+        """
+        spread = self.spread
+        width, height = content.get_size()
+        mask = pygame.Mask((width + spread * 2, height + spread * 2))
+        mask.draw(pygame.mask.from_surface(content, threshold=200), (spread, spread))
+
+        if self.surface is None or self.surface.get_size() != mask.get_size():
+            self.surface = pygame.Surface(mask.get_size(), pygame.SRCALPHA, 32)
+            changed = self.surface.get_rect()
+        else:
+            assert self.mask is not None
+            difference = mask.copy()
+            difference.erase(self.mask, (0, 0))
+            removed = self.mask.copy()
+            removed.erase(mask, (0, 0))
+            difference.draw(removed, (0, 0))
+            bounding_rects = difference.get_bounding_rects()
+            if not bounding_rects:
+                return []
+            changed = (
+                bounding_rects[0]
+                .unionall(bounding_rects[1:])
+                .inflate(spread * 2, spread * 2)
+                .clip(self.surface.get_rect())
+            )
+
+        self.mask = mask
+        self._render_area(changed)
+        return [changed.move(-spread, -spread)]
+
+    def _render_area(self, area: pygame.Rect) -> None:
+        # Shadow pixels depend on mask pixels up to spread away
+        assert self.surface is not None and self.mask is not None
+        source = area.inflate(self.spread * 2, self.spread * 2).clip(
+            self.surface.get_rect()
+        )
+        region = pygame.Mask(source.size)
+        region.draw(self.mask, (-source.x, -source.y))
+
+        shadow = self.blur(
+            region.to_surface(setcolor=(0, 0, 0, 255), unsetcolor=(0, 0, 0, 0)),
+            self.radius,
+        )
+        shadow.blit(
+            region.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0)),
+            (0, 0),
+            special_flags=pygame.BLEND_RGBA_SUB,
+        )
+
+        self.surface.fill((0, 0, 0, 0), area)
+        for _ in range(self.strength):
+            self.surface.blit(
+                shadow, area.topleft, area=area.move(-source.x, -source.y)
+            )
+
+    def draw(self, surface: pygame.Surface, position: Sequence[int], area: pygame.Rect) -> None:
+        """Blit the shadow of content placed at position, limited to area."""
+        if self.surface is None:
+            return
+        previous_clip = surface.get_clip()
+        surface.set_clip(area.clip(previous_clip))
+        surface.blit(
+            self.surface, (position[0] - self.spread, position[1] - self.spread)
+        )
+        surface.set_clip(previous_clip)
+
+
 class ScreenWidget(ContainerWidget):
     def __init__(
         self,
@@ -51,51 +160,58 @@ class ScreenWidget(ContainerWidget):
         self.image_path = image_path
         self.image: pygame.Surface | None = None
         self.drop_shadow = drop_shadow
+        self.shadow = (
+            DropShadow(blur=pygame.transform.box_blur, spread=5) if drop_shadow else None
+        )
         if image_path is not None:
             self.image = load_and_scale_image(image_path, size)
 
+        self.surface: pygame.Surface | None = None
+        self.damage: list[pygame.Rect] = []
+
     def add_widget(self, widget: Widget) -> None:
         if self.widget_list:
             raise Exception("ScreenWidget can only have one child")
         else:
             super().add_widget(widget)
 
-    @benchmark
     def render(self, size: tuple[int, int]) -> pygame.Surface:
-        super().render(size)
-
         if self.size != size and self.image_path is not None:
             self.image = load_and_scale_image(self.image_path, size)
 
-        surface = pygame.Surface(self.size, pygame.SRCALPHA, 32)
-        if self.image is not None:
-            surface.blit(self.image, (0, 0))
-        else:
-            surface.fill(self.color)
+        super().render(size)
 
         child_surface = self.widget_list[0].render(self.size)
 
-        if self.drop_shadow:
-            mask = pygame.mask.from_surface(child_surface, threshold=200)
-            mask_surface = mask.to_surface(
-                setcolor=(0, 0, 0, 255), unsetcolor=(0, 0, 0, 0)
-            )
-            white_mask_surface = mask.to_surface(
-                setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0)
-            )
-            blurred_mask_surface = pygame.transform.box_blur(mask_surface, radius=5)
-            blurred_mask_surface.blit(
-                white_mask_surface,
-                (0, 0),
-                special_flags=pygame.BLEND_RGBA_SUB,
-            )
+        screen_rect = pygame.Rect((0, 0), self.size)
+        if self.surface is None or self.surface.get_size() != self.size:
+            self.surface = pygame.Surface(self.size, pygame.SRCALPHA, 32)
+            damage = [screen_rect]
+        else:
+            damage = list(self.widget_list[0].get_damage())
 
-            surface.blit(blurred_mask_surface, (0, 0))
-        surface.blit(child_surface, (0, 0))
+        if self.shadow is not None and damage:
+            damage += [
+                rect.clip(screen_rect) for rect in self.shadow.update(child_surface)
+            ]
 
+        for rect in damage:
+            if self.image is not None:
+                self.surface.fill((0, 0, 0, 0), rect)
+                self.surface.blit(self.image, rect.topleft, area=rect)
+            else:
+                self.surface.fill(self.color, rect)
+            if self.shadow is not None:
+                self.shadow.draw(self.surface, (0, 0), rect)
+            self.surface.blit(child_surface, rect.topleft, area=rect)
+
+        self.damage = damage
         self.dirty = False
 
-        return surface
+        return self.surface
+
+    def get_damage(self) -> list[pygame.Rect]:
+        return self.damage
 
 
 class GridWidget(ContainerWidget):
@@ -138,6 +254,11 @@ class GridWidget(ContainerWidget):
 
         self.surface: pygame.Surface | None = None
         self.widget_surface: pygame.Surface | None = None
+        self.cell_rects: list[pygame.Rect] = []
+        self.cell_backgrounds: dict[tuple[int, int], pygame.Surface] = {}
+        self.corner_mask: pygame.Surface | None = None
+        self.shadows: dict[int, DropShadow] = {}
+        self.damage: list[pygame.Rect] = []
 
     def calculate_percentage_sizes(self, length: int, ratios: Sequence[float]) -> list[int]:
         percentage_ratios = [ratio / sum(ratios) for ratio in ratios]
@@ -158,155 +279,209 @@ class GridWidget(ContainerWidget):
 
         return absolute_start_coordinates
 
-    @benchmark
+    def calculate_layout(self) -> None:
+        """Compute everything that only depends on the grid's size.
+
+        This covers the padded rect of every cell, the cell background
+        shapes, the corner mask and the scaled background image, and runs
+        once per size change instead of on every render.
+        """
+        horizontal_sizes = self.calculate_percentage_sizes(
+            self.size[0], self.column_ratios
+        )
+        horizontal_positions = self.calculate_percentage_coordinates(horizontal_sizes)
+
+        vertical_sizes = self.calculate_percentage_sizes(self.size[1], self.row_ratios)
+        vertical_positions = self.calculate_percentage_coordinates(vertical_sizes)
+
+        self.cell_rects = [
+            pygame.Rect(
+                x + self.padding,
+                y + self.padding,
+                max(width - self.padding * 2, 0),
+                max(height - self.padding * 2, 0),
+            )
+            for (x, width), (y, height) in itertools.product(
+                zip(horizontal_positions, horizontal_sizes),
+                zip(vertical_positions, vertical_sizes),
+            )
+        ]
+
+        self.cell_backgrounds = {}
+        if self.widget_color is not None:
+            for cell_rect in self.cell_rects:
+                if cell_rect.size in self.cell_backgrounds:
+                    continue
+                background = pygame.Surface(cell_rect.size, pygame.SRCALPHA, 32)
+                if self.widget_corner_radius != 0:
+                    pygame.draw.rect(
+                        background,
+                        self.widget_color,
+                        background.get_rect(),
+                        border_radius=self.widget_corner_radius,
+                    )
+                else:
+                    background.fill(self.widget_color)
+                self.cell_backgrounds[cell_rect.size] = background
+
+        self.corner_mask = None
+        if self.corner_radius:
+            self.corner_mask = pygame.Surface(self.size, pygame.SRCALPHA)
+            self.corner_mask.fill((0, 0, 0, 0))
+            pygame.draw.rect(
+                self.corner_mask,
+                (255, 255, 255, 255),
+                pygame.Rect((0, 0), self.size),
+                border_radius=self.corner_radius,
+            )
+
+        if self.image_path is not None:
+            self.image = load_and_scale_image(self.image_path, self.size)
+
     def render(self, size: tuple[int, int]) -> pygame.Surface:
-        if size != self.size:
+        size = tuple(size)
+        if size != self.size or self.surface is None:
             self.size = size
             self.dirty = True
             self.surface = pygame.Surface(self.size, pygame.SRCALPHA, 32)
             self.widget_surface = pygame.Surface(self.size, pygame.SRCALPHA, 32)
-            if self.image is not None:
-                assert self.image_path is not None
-                self.image = load_and_scale_image(self.image_path, size)
+            self.calculate_layout()
 
         if not (self.is_dirty() or self.dirty):
             assert self.surface is not None
+            self.damage = []
             return self.surface
 
-        if self.image is None and self.image_path is not None:
-            self.image = load_and_scale_image(self.image_path, size)
-
-        horizontal_sizes = self.calculate_percentage_sizes(
-            self.size[0], self.column_ratios
-        )
-        horizontal_positions = self.calculate_percentage_coordinates(horizontal_sizes)
-
-        vertical_sizes = self.calculate_percentage_sizes(self.size[1], self.row_ratios)
-        vertical_positions = self.calculate_percentage_coordinates(vertical_sizes)
-
         assert self.surface is not None
         assert self.widget_surface is not None
 
-        for widget, coords, widget_size in zip(
-            self.widget_list,
-            itertools.product(horizontal_positions, vertical_positions),
-            itertools.product(horizontal_sizes, vertical_sizes),
+        full_redraw = self.dirty
+        grid_rect = pygame.Rect((0, 0), self.size)
+        damage: list[pygame.Rect] = []
+
+        for index, (widget, cell_rect) in enumerate(
+            zip(self.widget_list, self.cell_rects)
         ):
             if not widget.is_dirty() and not self.dirty:
                 continue
 
-            widget_size = list(widget_size)
-            widget_size[0] -= self.padding * 2
-            widget_size[1] -= self.padding * 2
-
-            coords = list(coords)
-            coords[0] += self.padding
-            coords[1] += self.padding
-
-            final_widget_surface = pygame.Surface(widget_size, pygame.SRCALPHA, 32)
-            if self.widget_color is not None:
-                if self.widget_corner_radius != 0:
-                    pygame.draw.rect(
-                        final_widget_surface,
-                        self.widget_color,
-                        pygame.Rect((0, 0), widget_size),
-                        border_radius=self.widget_corner_radius,
-                    )
-                else:
-                    final_widget_surface.fill(
-                        self.widget_color, pygame.Rect((0, 0), widget_size)
-                    )
-
             try:
-                if self.logger.getEffectiveLevel() == logging.DEBUG:
-                    start_time = time.time()
-                    widget_surf = widget.render(size=widget_size)
-                    end_time = time.time()
-                    execution_time = end_time - start_time
-                    widget.logger.debug(
-                        f"Execution time of rendering myself: {execution_time:.5f} seconds"
-                    )
-                else:
-                    widget_surf = widget.render(size=widget_size)
-                final_widget_surface.blit(
-                    widget_surf,
-                    (0, 0),
-                )
-                self.widget_surface.fill((0, 0, 0, 0), pygame.Rect(coords, widget_size))
-                self.widget_surface.blit(
-                    final_widget_surface,
-                    coords,
-                )
+                widget_surf = widget.render(cell_rect.size)
             except TypeError:
-                pass
+                continue
+
+            if self.dirty:
+                cell_damage = [cell_rect]
+            else:
+                cell_damage = [
+                    rect.move(cell_rect.topleft).clip(cell_rect)
+                    for rect in widget.get_damage()
+                ]
+            background = self.cell_backgrounds.get(cell_rect.size)
+            for rect in cell_damage:
+                if not rect.width or not rect.height:
+                    continue
+                cell_area = rect.move(-cell_rect.x, -cell_rect.y)
+                self.widget_surface.fill((0, 0, 0, 0), rect)
+                if background is not None:
+                    self.widget_surface.blit(background, rect.topleft, area=cell_area)
+                self.widget_surface.blit(widget_surf, rect.topleft, area=cell_area)
+                damage.append(rect)
+
+            if self.drop_shadow:
+                shadow = self.shadows.get(index)
+                if shadow is None:
+                    shadow = self.shadows[index] = DropShadow(strength=3)
+                for rect in shadow.update(self.widget_surface.subsurface(cell_rect)):
+                    damage.append(rect.move(cell_rect.topleft).clip(grid_rect))
 
         self.dirty = False
 
-        if self.image is not None:
-            self.surface.blit(self.image, (0, 0))
-        else:
-            self.surface.fill(self.color or (0, 0, 0, 0))
+        if full_redraw:
+            damage = [grid_rect]
 
-        if self.drop_shadow:
-            mask = pygame.mask.from_surface(self.widget_surface, threshold=200)
-            mask_surface = mask.to_surface(
-                setcolor=(0, 0, 0, 255), unsetcolor=(0, 0, 0, 0)
-            )
-            white_mask_surface = mask.to_surface(
-                setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0)
-            )
-            blurred_mask_surface = pygame.transform.gaussian_blur(
-                mask_surface, radius=5
-            )
-            blurred_mask_surface.blit(
-                white_mask_surface,
-                (0, 0),
-                special_flags=pygame.BLEND_RGBA_SUB,
-            )
+        for rect in damage:
+            if self.image is not None:
+                self.surface.fill((0, 0, 0, 0), rect)
+                self.surface.blit(self.image, rect.topleft, area=rect)
+            else:
+                self.surface.fill(self.color or (0, 0, 0, 0), rect)
+            for index, shadow in self.shadows.items():
+                shadow.draw(self.surface, self.cell_rects[index].topleft, rect)
+            self.surface.blit(self.widget_surface, rect.topleft, area=rect)
+            if self.corner_mask is not None:
+                self.surface.blit(
+                    self.corner_mask,
+                    rect.topleft,
+                    area=rect,
+                    special_flags=pygame.BLEND_RGBA_MIN,
+                )
 
-            self.surface.blit(blurred_mask_surface, (0, 0))
-            self.surface.blit(blurred_mask_surface, (0, 0))
-            self.surface.blit(blurred_mask_surface, (0, 0))
+        self.damage = damage
+        return self.surface
 
-        self.surface.blit(self.widget_surface, (0, 0))
+    def get_damage(self) -> list[pygame.Rect]:
+        return self.damage
 
-        if self.corner_radius:
-            mask_surface = pygame.Surface(self.size, pygame.SRCALPHA)
-            mask_surface.fill((0, 0, 0, 0))
-            pygame.draw.rect(
-                mask_surface,
-                (255, 255, 255, 255),
-                pygame.Rect((0, 0), self.size),
-                border_radius=self.corner_radius,
-            )
-            self.surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
 
-        return self.surface
+class FlipWidget(ContainerWidget):
+    """Shows one child at a time, periodically transitioning to the next one.
 
+    Subclasses decide when to move and where to by calling
+    start_transition(). The transition itself is shared: both children are
+    rendered once when it starts, and every animation frame is composed
+    from those snapshots, which are released when the transition ends.
+    """
 
-class FlipWidget(ContainerWidget):
-    def __init__(self, interval: int = 5, transition: float = 1, ease: int = 2, **kwargs: Any) -> None:
+    transition_types = ("slide", "crossfade")
+
+    def __init__(
+        self,
+        interval: int = 5,
+        transition: float = 1,
+        ease: int = 2,
+        transition_type: str = "slide",
+        **kwargs: Any,
+    ) -> None:
         super().__init__(**kwargs)
+        if transition_type not in self.transition_types:
+            raise ValueError(f"Unknown transition type '{transition_type}'")
         self.last_update = int(time.time())
         self.moving = False
         self.current_widget = 0
+        self.destination_widget: int | None = None
         self.ticker = self.last_update
         self.interval = interval
         self.transition = transition
         self.ease = ease
+        self.transition_type = transition_type
+        self.snapshots: tuple[pygame.Surface, pygame.Surface] | None = None
+        self.frame: pygame.Surface | None = None
 
     def is_dirty(self) -> bool:
         return self.moving or self.widget_list[self.current_widget].is_dirty()
 
+    def next_deadline(self) -> float | None:
+        if self.moving:
+            return time.time()
+        return earliest(
+            self.last_update + self.interval,
+            self.widget_list[self.current_widget].next_deadline(),
+        )
+
     def ease_in_out(self, value: float, ease: int) -> float:
         return (value**ease) / ((value**ease) + ((1 - value) ** ease))
 
+    def start_transition(self, destination_widget: int) -> None:
+        self.moving = True
+        self.destination_widget = destination_widget
+        self.ticker = time.time()
+        self.last_update = int(time.time())
+
     def tick(self) -> None:
         if time.time() - self.last_update >= self.interval:
             if not self.moving:  # This allows for the current animation to complete
-                self.moving = True
-                self.ticker = time.time()
-                self.last_update = int(time.time())
+                self.start_transition((self.current_widget + 1) % len(self.widget_list))
 
         if self.moving:
             for widget in self.widget_list:
@@ -315,37 +490,49 @@ class FlipWidget(ContainerWidget):
             self.widget_list[self.current_widget].tick()
 
     def render(self, size: tuple[int, int]) -> pygame.Surface:
-        if self.moving:
-            surface = pygame.Surface(size, pygame.SRCALPHA, 32)
-            if self.transition != 0:
-                transition_percentage = min(
-                    self.ease_in_out(
-                        (time.time() - self.ticker) / self.transition, self.ease
-                    ),
-                    1,
-                )
-            else:
-                transition_percentage = 1
-
-            current_widget = self.widget_list[self.current_widget]
-            next_widget = self.widget_list[
-                (self.current_widget + 1) % len(self.widget_list)
-            ]
+        if not self.moving:
+            assert self.current_widget is not None
+            return self.widget_list[self.current_widget].render(size)
 
-            surface.blit(
-                current_widget.render(size), (-(size[0] * transition_percentage), 0)
+        assert self.current_widget is not None
+        assert self.destination_widget is not None
+        size = tuple(size)
+        if self.snapshots is None or self.snapshots[0].get_size() != size:
+            # Children are rendered once per transition; copies are needed
+            # because containers keep drawing into the surfaces they return
+            self.snapshots = (
+                self.widget_list[self.current_widget].render(size).copy(),
+                self.widget_list[self.destination_widget].render(size).copy(),
             )
-            surface.blit(
-                next_widget.render(size), (size[0] * (1 - transition_percentage), 0)
+            self.frame = pygame.Surface(size, pygame.SRCALPHA, 32)
+        assert self.frame is not None
+
+        if self.transition != 0:
+            transition_percentage = self.ease_in_out(
+                min((time.time() - self.ticker) / self.transition, 1), self.ease
             )
+        else:
+            transition_percentage = 1
+
+        current_surface, next_surface = self.snapshots
+        self.frame.fill((0, 0, 0, 0))
+        if self.transition_type == "crossfade":
+            current_surface.set_alpha(round(255 * (1 - transition_percentage)))
+            next_surface.set_alpha(round(255 * transition_percentage))
+            self.frame.blit(current_surface, (0, 0))
+            self.frame.blit(next_surface, (0, 0))
+        else:
+            self.frame.blit(current_surface, (-(size[0] * transition_percentage), 0))
+            self.frame.blit(next_surface, (size[0] * (1 - transition_percentage), 0))
 
-            if time.time() - self.ticker >= self.transition:
-                self.moving = False
-                self.current_widget = (self.current_widget + 1) % len(self.widget_list)
+        frame = self.frame
+        if time.time() - self.ticker >= self.transition:
+            self.moving = False
+            self.current_widget = self.destination_widget
+            self.snapshots = None
+            self.frame = None
 
-            return surface
-        else:
-            return self.widget_list[self.current_widget].render(size)
+        return frame
 
 
 class ScheduleFlipWidget(FlipWidget):
@@ -353,7 +540,6 @@ class ScheduleFlipWidget(FlipWidget):
         super().__init__(**kwargs)
         self.current_widget = None
         self.schedule = schedule or {}
-        self.destination_widget: int | None = None
 
     def get_current_widget(self, current_time: datetime_time) -> int | None:
         # Convert schedule to sorted list of (time, widget) tuples
@@ -381,16 +567,23 @@ class ScheduleFlipWidget(FlipWidget):
 
         return None
 
+    def next_deadline(self) -> float | None:
+        if self.moving:
+            return time.time()
+        if self.current_widget is None:
+            # Nothing scheduled right now; check again when the minute changes
+            return next_minute()
+        return earliest(
+            next_minute(), self.widget_list[self.current_widget].next_deadline()
+        )
+
     def tick(self) -> None:
         if self.current_widget is None:
             self.current_widget = self.get_current_widget(datetime.now().time())
         current_widget = self.get_current_widget(datetime.now().time())
         if current_widget != self.current_widget:
             if not self.moving:  # This allows for the current animation to complete
-                self.moving = True
-                self.destination_widget = current_widget
-                self.ticker = time.time()
-                self.last_update = int(time.time())
+                self.start_transition(current_widget)
 
         if self.moving:
             assert self.current_widget is not None
@@ -404,40 +597,6 @@ class ScheduleFlipWidget(FlipWidget):
             assert self.current_widget is not None
             self.widget_list[self.current_widget].tick()
 
-    def render(self, size: tuple[int, int]) -> pygame.Surface:
-        if self.moving:
-            assert self.current_widget is not None
-            assert self.destination_widget is not None
-            surface = pygame.Surface(size, pygame.SRCALPHA, 32)
-            if self.transition != 0:
-                transition_percentage = min(
-                    self.ease_in_out(
-                        (time.time() - self.ticker) / self.transition, self.ease
-                    ),
-                    1,
-                )
-            else:
-                transition_percentage = 1
-
-            current_widget = self.widget_list[self.current_widget]
-            next_widget = self.widget_list[self.destination_widget]
-
-            surface.blit(
-                current_widget.render(size), (-(size[0] * transition_percentage), 0)
-            )
-            surface.blit(
-                next_widget.render(size), (size[0] * (1 - transition_percentage), 0)
-            )
-
-            if time.time() - self.ticker >= self.transition:
-                self.moving = False
-                self.current_widget = self.destination_widget
-
-            return surface
-        else:
-            assert self.current_widget is not None
-            return self.widget_list[self.current_widget].render(size)
-
 
 class PillWidget(ContainerWidget):
     """A container widget that superimposes a second widget in a pill shape on top of the first."""
@@ -480,7 +639,6 @@ class PillWidget(ContainerWidget):
         for widget in self.widget_list:
             widget.tick()
 
-    @benchmark
     def render(self, size: tuple[int, int]) -> pygame.Surface:
         if len(self.widget_list) != 2:
             surface = pygame.Surface(size, pygame.SRCALPHA, 32)
@@ -577,6 +735,7 @@ class HTTPFlipWidget(FlipWidget, UpdaterWidget):
         self.url = url
         self.json_path = json_path
         self.jq_expression = jq_expression
+        self.extractor = get_extractor(json_path, jq_expression)
         self.update_frequency = 5
         self.value = ""
         self.method = method or "GET"
@@ -620,6 +779,14 @@ class HTTPFlipWidget(FlipWidget, UpdaterWidget):
             self.logger.debug(f"No mapping for {response_value}")
             return self.default_widget
 
+    def next_deadline(self) -> float | None:
+        # Value changes are signalled by the updater thread
+        if self.moving:
+            return time.time()
+        if self.current_widget is None:
+            return None
+        return self.widget_list[self.current_widget].next_deadline()
+
     def tick(self) -> None:
         if self.current_widget is None:
             self.current_widget = self.get_current_widget(self.value)
@@ -631,10 +798,7 @@ class HTTPFlipWidget(FlipWidget, UpdaterWidget):
 
         if current_widget != self.current_widget:
             if not self.moving:  # This allows for the current animation to complete
-                self.moving = True
-                self.destination_widget = current_widget
-                self.ticker = time.time()
-                self.last_update = int(time.time())
+                self.start_transition(current_widget)
 
         if self.moving:
             assert self.current_widget is not None
@@ -651,24 +815,18 @@ class HTTPFlipWidget(FlipWidget, UpdaterWidget):
     def update(self) -> None:
         """Perform HTTP request and determine target widget"""
         try:
-            response = requests.request(
-                method=self.method, url=self.url, **self.requests_kwargs
+            response = http_client.fetch(
+                self.method, self.url, **self.requests_kwargs
             )
 
             if response.status_code != 200:
                 self.logger.warning(f"HTTP error: {response.status_code}")
                 return
 
-            if self.json_path is not None or self.jq_expression is not None:
+            if self.extractor is not None:
                 try:
                     response_json = response.json()
-                    self.value = str(
-                        extract_data(
-                            response_json,
-                            json_path=self.json_path,
-                            jq_expression=self.jq_expression,
-                        )
-                    )
+                    self.value = str(self.extractor.extract(response_json))
                 except Exception as e:
                     self.logger.error(f"JSON extraction error: {e}")
                     return
@@ -681,37 +839,3 @@ class HTTPFlipWidget(FlipWidget, UpdaterWidget):
             self.logger.warning(f"Connection error: {e}")
         except Exception as e:
             self.logger.error(f"Unexpected error: {e}")
-
-    def render(self, size: tuple[int, int]) -> pygame.Surface:
-        if self.moving:
-            assert self.current_widget is not None
-            assert self.destination_widget is not None
-            surface = pygame.Surface(size, pygame.SRCALPHA, 32)
-            if self.transition != 0:
-                transition_percentage = min(
-                    self.ease_in_out(
-                        (time.time() - self.ticker) / self.transition, self.ease
-                    ),
-                    1,
-                )
-            else:
-                transition_percentage = 1
-
-            current_widget = self.widget_list[self.current_widget]
-            next_widget = self.widget_list[self.destination_widget]
-
-            surface.blit(
-                current_widget.render(size), (-(size[0] * transition_percentage), 0)
-            )
-            surface.blit(
-                next_widget.render(size), (size[0] * (1 - transition_percentage), 0)
-            )
-
-            if time.time() - self.ticker >= self.transition:
-                self.moving = False
-                self.current_widget = self.destination_widget
-
-            return surface
-        else:
-            assert self.current_widget is not None
-            return self.widget_list[self.current_widget].render(size)
@@ -1,33 +1,123 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
 import logging
+import os
 import threading
+from collections import OrderedDict
 from typing import Any
 
 import pygame
-import requests
 
-from grydgets.json_utils import extract_data
+from grydgets.http_client import http_client
+from grydgets.json_utils import get_extractor
 from grydgets.widgets.base import Widget, UpdaterWidget
 
 smooth_scaling: bool = True
 
 
+class ImageCache:
+    """LRU cache of decoded images and their scaled variants.
+
+    Entries are keyed on a hash of the encoded image, so the same picture
+    fetched again (or shown by several widgets) is decoded and scaled to a
+    given size only once. The cache is bounded by the size in bytes of the
+    surfaces it holds.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key: tuple) -> pygame.Surface | None:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return surface
+
+    def _put(self, key: tuple, surface: pygame.Surface) -> None:
+        surface_bytes = surface.get_pitch() * surface.get_height()
+        if surface_bytes > self.max_bytes:
+            return
+        self._surfaces[key] = surface
+        self._bytes += surface_bytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._surfaces.popitem(last=False)
+            self._bytes -= evicted.get_pitch() * evicted.get_height()
+            self.evictions += 1
+
+    def get_decoded(self, image_hash: bytes, image_data: bytes) -> pygame.Surface:
+        """Return the decoded image, decoding it if needed.
+
+        Raises:
+            pygame.error: If the image can't be decoded.
+        """
+        key = (image_hash, None, None)
+        surface = self._get(key)
+        if surface is None:
+            surface = pygame.image.load(io.BytesIO(image_data))
+            self._put(key, surface)
+        return surface
+
+    def get_scaled(
+        self, image_hash: bytes, image_data: bytes, size: tuple[int, int]
+    ) -> pygame.Surface:
+        """Return the image scaled to size, scaling (and decoding) it if needed."""
+        key = (image_hash, tuple(size), smooth_scaling)
+        surface = self._get(key)
+        if surface is None:
+            decoded = self.get_decoded(image_hash, image_data)
+            scale_fn = pygame.transform.smoothscale if smooth_scaling else pygame.transform.scale
+            surface = scale_fn(decoded, size)
+            self._put(key, surface)
+        return surface
+
+    def get_stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current memory use."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._surfaces),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+image_cache = ImageCache()
+
+
+def hash_image(image_data: bytes | None) -> bytes | None:
+    if image_data is None:
+        return None
+    return hashlib.sha1(image_data).digest()
+
+
 class ImageWidget(Widget):
     def __init__(self, image_data: bytes | None = None, preserve_aspect_ratio: bool = False, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.image_update_lock = threading.Lock()
         self.image_data = image_data
+        self.image_hash = hash_image(image_data)
         self.preserve_aspect_ratio = preserve_aspect_ratio
         self.old_surface: pygame.Surface | None = None
         self.dirty = True
 
     def set_image(self, image_data: bytes) -> None:
-        if image_data != self.image_data:
+        image_hash = hash_image(image_data)
+        if image_hash != self.image_hash:
             with self.image_update_lock:
                 self.image_data = image_data
+                self.image_hash = image_hash
             self.dirty = True
 
     def render(self, size: tuple[int, int]) -> pygame.Surface:
@@ -36,14 +126,15 @@ class ImageWidget(Widget):
         if self.image_data is None:
             self.old_surface = pygame.Surface(self.size, pygame.SRCALPHA, 32)
         elif self.dirty:
+            with self.image_update_lock:
+                image_data = self.image_data
+                image_hash = self.image_hash
             try:
-                with self.image_update_lock:
-                    loaded_image_surface = pygame.image.load(
-                        io.BytesIO(self.image_data)
-                    )
+                loaded_image_surface = image_cache.get_decoded(image_hash, image_data)
             except pygame.error:
                 with self.image_update_lock:
                     self.image_data = None
+                    self.image_hash = None
                 if self.old_surface is not None:
                     return self.old_surface
                 return pygame.Surface(self.size, pygame.SRCALPHA, 32)
@@ -86,8 +177,7 @@ class ImageWidget(Widget):
                         final_size = adjusted_size
                         break
 
-            scale_fn = pygame.transform.smoothscale if smooth_scaling else pygame.transform.scale
-            resized_picture = scale_fn(loaded_image_surface, final_size)
+            resized_picture = image_cache.get_scaled(image_hash, image_data, final_size)
             picture_position = (
                 (self.size[0] - final_size[0]) / 2,
                 (self.size[1] - final_size[1]) / 2,
@@ -116,8 +206,11 @@ class RESTImageWidget(UpdaterWidget):
         self.url = url
         self.json_path = json_path
         self.jq_expression = jq_expression
+        self.extractor = get_extractor(json_path, jq_expression)
         self.update_frequency = 30
         self.image_widget = ImageWidget(preserve_aspect_ratio=preserve_aspect_ratio)
+        # (path, mtime, size) of the last local file that was read
+        self.file_signature: tuple[str, int, int] | None = None
 
         self.requests_kwargs: dict[str, Any] = {"headers": {}}
         if auth is not None:
@@ -139,37 +232,43 @@ class RESTImageWidget(UpdaterWidget):
     def is_dirty(self) -> bool:
         return self.image_widget.is_dirty()
 
+    def read_local_file(self, file_path: str) -> bytes | None:
+        """Read a local image, or return None if it didn't change since last time."""
+        stat = os.stat(file_path)
+        signature = (file_path, stat.st_mtime_ns, stat.st_size)
+        if signature == self.file_signature:
+            return None
+        self.logger.debug(f"Loading image from local file: {file_path}")
+        with open(file_path, "rb") as f:
+            image_data = f.read()
+        self.file_signature = signature
+        return image_data
+
     def update(self) -> None:
         try:
             # Check if main URL is a file:// URL
             if self.url.startswith("file://"):
                 file_path = self.url[7:]  # Remove 'file://' prefix
-                self.logger.debug(f"Loading image from local file: {file_path}")
-
-                with open(file_path, "rb") as f:
-                    image_data = f.read()
+                image_data = self.read_local_file(file_path)
+                if image_data is None:
+                    return
 
                 self.logger.debug("Updated from local file")
             else:
                 # Handle HTTP/HTTPS URLs
-                response = requests.get(self.url, **self.requests_kwargs)
-                if self.json_path is not None or self.jq_expression is not None:
+                response = http_client.fetch("GET", self.url, **self.requests_kwargs)
+                if self.extractor is not None:
                     response_json = response.json()
-                    image_url = extract_data(
-                        response_json,
-                        json_path=self.json_path,
-                        jq_expression=self.jq_expression,
-                    )
+                    image_url = self.extractor.extract(response_json)
 
                     # Check if extracted URL is a file:// URL
                     if image_url.startswith("file://"):
                         file_path = image_url[7:]  # Remove 'file://' prefix
-                        self.logger.debug(f"Loading image from local file: {file_path}")
-
-                        with open(file_path, "rb") as f:
-                            image_data = f.read()
+                        image_data = self.read_local_file(file_path)
+                        if image_data is None:
+                            return
                     else:
-                        image_response = requests.get(image_url)
+                        image_response = http_client.fetch("GET", image_url)
                         image_data = image_response.content
                 else:
                     image_data = response.content
@@ -7,7 +7,9 @@ from typing import Any
 
 import requests
 
-from grydgets.widgets.base import ContainerWidget
+from grydgets.http_client import http_client
+from grydgets.scheduler import scheduler
+from grydgets.widgets.base import ContainerWidget, Widget
 from grydgets.widgets.image import ImageWidget
 from grydgets.widgets.text import TextWidget
 
@@ -51,6 +53,7 @@ class NotifiableTextWidget(ContainerWidget):
     def notify(self, data: dict[str, Any]) -> None:
         self.logger.debug("Received notification")
         self.notification_queue.put(data)
+        scheduler.wake()
 
     def is_dirty(self) -> bool:
         if self.showing_text:
@@ -60,6 +63,15 @@ class NotifiableTextWidget(ContainerWidget):
         else:
             return self.widget_list[0].is_dirty()
 
+    def next_deadline(self) -> float | None:
+        if self.showing_text:
+            if self.rendering_start_time is None:
+                return time.time()
+            return self.rendering_start_time + self.notification_duration
+        if not self.notification_queue.empty():
+            return time.time()
+        return self.widget_list[0].next_deadline()
+
     def tick(self) -> None:
         if (
             self.showing_text
@@ -130,6 +142,7 @@ class NotifiableImageWidget(ContainerWidget):
     def notify(self, data: dict[str, Any]) -> None:
         self.logger.debug("Received image notification")
         self.notification_queue.put(data)
+        scheduler.wake()
 
     def is_dirty(self) -> bool:
         with self._lock:
@@ -140,6 +153,16 @@ class NotifiableImageWidget(ContainerWidget):
             else:
                 return self.widget_list[0].is_dirty()
 
+    def next_deadline(self) -> float | None:
+        with self._lock:
+            if self.showing_image:
+                if self.rendering_start_time is None:
+                    return time.time()
+                return self.rendering_start_time + self.notification_duration
+        if not self.notification_queue.empty():
+            return time.time()
+        return self.widget_list[0].next_deadline()
+
     def tick(self) -> None:
         with self._lock:
             if (
@@ -185,9 +208,13 @@ class NotifiableImageWidget(ContainerWidget):
                 return self.other_widget_surface
 
     def _fetch_and_set_image(self, url: str) -> None:
+        if Widget.offline:
+            self.logger.debug(f"Offline, not fetching image from {url}")
+            return
+
         def fetch_image() -> None:
             try:
-                response = requests.get(url, timeout=10)
+                response = http_client.get(url, timeout=10)
                 response.raise_for_status()
                 image_data = response.content
 
@@ -195,6 +222,7 @@ class NotifiableImageWidget(ContainerWidget):
                     self.image_widget.set_image(image_data)
                     self.showing_image = True
                     self.dirty = True
+                scheduler.wake()
 
             except requests.RequestException as e:
                 self.logger.error(f"Failed to fetch image: {e}")
@@ -9,9 +9,8 @@ import time
 from typing import Any
 
 import pygame
-import requests
 
-from grydgets.json_utils import extract_data
+from grydgets.http_client import http_client
 from grydgets.providers.base import DataProvider
 from grydgets.widgets.base import Widget, ContainerWidget
 from grydgets.widgets.text import TextWidget
@@ -44,6 +43,7 @@ class ProviderWidget(Widget):
         self.provider = list(providers.values())[0]
         self.data_path = data_path
         self.jq_expression = jq_expression
+        self.extractor = self.provider.register_extraction(data_path, jq_expression)
         self.format_string = format_string
         self.fallback_text = fallback_text
         self.show_errors = show_errors
@@ -82,14 +82,7 @@ class ProviderWidget(Widget):
                 text = self.fallback_text
             else:
                 try:
-                    if self.data_path or self.jq_expression:
-                        value = extract_data(
-                            data,
-                            json_path=self.data_path,
-                            jq_expression=self.jq_expression,
-                        )
-                    else:
-                        value = data
+                    value = self.provider.get_extracted(self.extractor)
                     text = self.format_string.format(value=value)
                 except (
                     KeyError,
@@ -165,6 +158,10 @@ class ProviderTemplateWidget(Widget):
                     return self.text_widget.render(size)
                 provider_data[f"provider_{name}"] = data
 
+            if Widget.offline:
+                self.text_widget.set_text(self.fallback_text)
+                return self.text_widget.render(size)
+
             template_lines = []
             for var_name, data in provider_data.items():
                 template_lines.append(f"{{% set {var_name} = {data} %}}")
@@ -172,7 +169,7 @@ class ProviderTemplateWidget(Widget):
             template_lines.append(self.template)
             full_template = "\n".join(template_lines)
 
-            response = requests.post(
+            response = http_client.post(
                 f"{self.hass_url}/api/template",
                 headers={
                     "Authorization": f"Bearer {self.hass_token}",
@@ -217,6 +214,7 @@ class ProviderFlipWidget(FlipWidget):
         self.provider = list(providers.values())[0]
         self.data_path = data_path
         self.jq_expression = jq_expression
+        self.extractor = self.provider.register_extraction(data_path, jq_expression)
         self.mapping: dict[str, str] = mapping or {}
         self.default_widget = 0
         self.default_widget_name = default_widget
@@ -225,7 +223,6 @@ class ProviderFlipWidget(FlipWidget):
         self.current_value: str | None = None
 
         self.current_widget = None
-        self.destination_widget: int | None = None
 
     def add_widget(self, widget: Widget) -> None:
         super().add_widget(widget)
@@ -244,6 +241,14 @@ class ProviderFlipWidget(FlipWidget):
             self.logger.debug(f"No mapping for value '{value}'")
             return self.default_widget
 
+    def next_deadline(self) -> float | None:
+        # Value changes are signalled by the provider
+        if self.moving:
+            return time.time()
+        if self.current_widget is None:
+            return None
+        return self.widget_list[self.current_widget].next_deadline()
+
     def tick(self) -> None:
         if self.current_widget is None:
             self.current_widget = self.default_widget
@@ -261,16 +266,7 @@ class ProviderFlipWidget(FlipWidget):
                 )
             else:
                 try:
-                    if self.data_path or self.jq_expression:
-                        value = str(
-                            extract_data(
-                                data,
-                                json_path=self.data_path,
-                                jq_expression=self.jq_expression,
-                            )
-                        )
-                    else:
-                        value = str(data)
+                    value = str(self.provider.get_extracted(self.extractor))
 
                     if value != self.current_value:
                         self.current_value = value
@@ -281,10 +277,7 @@ class ProviderFlipWidget(FlipWidget):
                             and target_widget != self.current_widget
                         ):
                             if not self.moving:
-                                self.moving = True
-                                self.destination_widget = target_widget
-                                self.ticker = time.time()
-                                self.last_update = int(time.time())
+                                self.start_transition(target_widget)
                                 self.logger.debug(
                                     f"Value changed to '{value}', switching to widget {target_widget}"
                                 )
@@ -310,40 +303,6 @@ class ProviderFlipWidget(FlipWidget):
             assert self.current_widget is not None
             self.widget_list[self.current_widget].tick()
 
-    def render(self, size: tuple[int, int]) -> pygame.Surface:
-        if self.moving:
-            assert self.current_widget is not None
-            assert self.destination_widget is not None
-            surface = pygame.Surface(size, pygame.SRCALPHA, 32)
-            if self.transition != 0:
-                transition_percentage = min(
-                    self.ease_in_out(
-                        (time.time() - self.ticker) / self.transition, self.ease
-                    ),
-                    1,
-                )
-            else:
-                transition_percentage = 1
-
-            current_widget = self.widget_list[self.current_widget]
-            next_widget = self.widget_list[self.destination_widget]
-
-            surface.blit(
-                current_widget.render(size), (-(size[0] * transition_percentage), 0)
-            )
-            surface.blit(
-                next_widget.render(size), (size[0] * (1 - transition_percentage), 0)
-            )
-
-            if time.time() - self.ticker >= self.transition:
-                self.moving = False
-                self.current_widget = self.destination_widget
-
-            return surface
-        else:
-            assert self.current_widget is not None
-            return self.widget_list[self.current_widget].render(size)
-
 
 class ProviderImageWidget(Widget):
     """Widget that displays images from URLs in provider data."""
@@ -367,6 +326,7 @@ class ProviderImageWidget(Widget):
         self.provider = list(providers.values())[0]
         self.data_path = data_path
         self.jq_expression = jq_expression
+        self.extractor = self.provider.register_extraction(data_path, jq_expression)
         self.fallback_image = fallback_image
 
         self.last_seen_timestamp = 0
@@ -415,14 +375,7 @@ class ProviderImageWidget(Widget):
 
             if not error and data is not None:
                 try:
-                    if self.data_path or self.jq_expression:
-                        image_url = extract_data(
-                            data,
-                            json_path=self.data_path,
-                            jq_expression=self.jq_expression,
-                        )
-                    else:
-                        image_url = data
+                    image_url = self.provider.get_extracted(self.extractor)
 
                     if image_url != self.current_image_url:
                         self.current_image_url = image_url
@@ -450,8 +403,10 @@ class ProviderImageWidget(Widget):
 
                 self.image_widget.set_image(image_data)
                 self.logger.debug(f"Loaded image from {file_path}")
+            elif Widget.offline:
+                self.logger.debug(f"Offline, not fetching image from {url}")
             else:
-                response = requests.get(url, **self.requests_kwargs, timeout=5)
+                response = http_client.fetch("GET", url, **self.requests_kwargs, timeout=5)
                 if response.status_code == 200:
                     self.image_widget.set_image(response.content)
                     self.logger.debug(f"Fetched image from {url}")
@@ -10,10 +10,10 @@ import requests
 
 from grydgets.widgets.base import Widget, UpdaterWidget, ContainerWidget
 from grydgets.widgets.containers import GridWidget
-from grydgets.fonts import FontCache
-from grydgets.json_utils import extract_data
-
-font_cache = FontCache()
+from grydgets.fonts import font_cache, text_cache
+from grydgets.http_client import http_client
+from grydgets.json_utils import get_extractor
+from grydgets.scheduler import next_minute
 
 
 class TextWidget(Widget):
@@ -38,6 +38,7 @@ class TextWidget(Widget):
         self.dirty = True
         self.surface: pygame.Surface | None = None
         self.text_size = text_size
+        self.fitted_text_size: int | None = None
 
     def set_text(self, text: str) -> None:
         if text != self.text:
@@ -59,12 +60,18 @@ class TextWidget(Widget):
                 self.size[1] - (self.padding * 2),
             )
 
-            text_size = self.text_size or real_size[1]
+            text_size = font_cache.fit_text_size(
+                self.font_path,
+                self.text,
+                max(self.text_size or real_size[1], 1),
+                real_size[0],
+                hint=self.fitted_text_size,
+            )
+            self.fitted_text_size = text_size
             font = font_cache.get_font(self.font_path, text_size)
-            while font.size(self.text)[0] > real_size[0] and text_size > 1:
-                text_size -= 1
-                font = font_cache.get_font(self.font_path, text_size)
-            text_surface = font.render(self.text, True, self.color)
+            text_surface = text_cache.render(
+                self.font_path, text_size, self.text, self.color
+            )
 
             blit_coordinates = [self.padding, self.padding]
             if self.align == "center":
@@ -127,6 +134,9 @@ class DateClockWidget(Widget):
     def is_dirty(self) -> bool:
         return self.hour_widget.is_dirty() or self.date_widget.is_dirty()
 
+    def next_deadline(self) -> float | None:
+        return next_minute()
+
     def tick(self) -> None:
         self.hour_widget.set_text(datetime.datetime.now().strftime("%H:%M"))
         self.date_widget.set_text(datetime.datetime.now().strftime("%A, %B %d"))
@@ -141,6 +151,9 @@ class DateClockWidget(Widget):
         assert self.surface is not None
         return self.surface
 
+    def get_damage(self) -> list[pygame.Rect]:
+        return self.grid_widget.get_damage()
+
 
 class RESTWidget(UpdaterWidget):
     def __init__(
@@ -160,6 +173,7 @@ class RESTWidget(UpdaterWidget):
         self.url = url
         self.json_path = json_path
         self.jq_expression = jq_expression
+        self.extractor = get_extractor(json_path, jq_expression)
         self.format_string = format_string or "{}"
         self.update_frequency = 30
         self.value = ""
@@ -198,19 +212,15 @@ class RESTWidget(UpdaterWidget):
 
     def update(self) -> None:
         try:
-            response = requests.request(
-                method=self.method, url=self.url, **self.requests_kwargs
+            response = http_client.fetch(
+                self.method, self.url, **self.requests_kwargs
             )
             if response.status_code != 200:
                 text = "Error {}".format(response.status_code)
-            elif self.json_path is not None or self.jq_expression is not None:
+            elif self.extractor is not None:
                 response_json = response.json()
                 try:
-                    text = extract_data(
-                        response_json,
-                        json_path=self.json_path,
-                        jq_expression=self.jq_expression
-                    )
+                    text = self.extractor.extract(response_json)
                 except Exception as e:
                     self.logger.error(e)
                     text = "--"
@@ -280,5 +290,14 @@ class LabelWidget(ContainerWidget):
             self.grid_widget.add_widget(widget)
             self.grid_widget.add_widget(self.text_widget)
 
+    def replace_widget(self, index: int, widget: Widget) -> None:
+        old_widget = self.widget_list[index]
+        super().replace_widget(index, widget)
+        grid_index = self.grid_widget.widget_list.index(old_widget)
+        self.grid_widget.replace_widget(grid_index, widget)
+
     def render(self, size: tuple[int, int]) -> pygame.Surface:
         return self.grid_widget.render(size)
+
+    def get_damage(self) -> list[pygame.Rect]:
+        return self.grid_widget.get_damage()
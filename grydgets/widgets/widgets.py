@@ -4,6 +4,7 @@ import logging
 import pprint
 import sys
 
+from grydgets.profiler import profiler
 from grydgets.widgets.base import Widget, ContainerWidget, UpdaterWidget
 import grydgets.widgets.image
 import grydgets.widgets.text
@@ -48,7 +49,13 @@ class WidgetManager:
                 if class_name:
                     self._name_to_widget_map[class_name] = obj
 
-    def create_widget_tree(self, widget_dictionary, path=None, counter=None):
+    def create_widget_tree(self, widget_dictionary, path=None, counter=None, created=None):
+        """Create a widget and its children from their configuration.
+
+        If a created list is given, the new widgets are appended to it
+        instead of being attached to the profiler, so a tree built on the
+        side doesn't show up in the stats until it is swapped in.
+        """
         if path is None:
             path = []
         if counter is None:
@@ -85,6 +92,27 @@ class WidgetManager:
             widget_parameters["providers"] = provider_dict
 
         widget = self._name_to_widget_map[widget_type_name](**widget_parameters)
+        if created is None:
+            profiler.attach(widget)
+        else:
+            created.append(widget)
+        self.register_notifiable(widget, widget_name)
+
+        if "children" in widget_dictionary:
+            child_counter = {}  # Reset counter for children
+            for child in widget_dictionary["children"]:
+                widget.add_widget(
+                    self.create_widget_tree(
+                        child,
+                        path + [f"{widget_name}{counter[widget_name]}"],
+                        child_counter,
+                        created,
+                    )
+                )
+
+        return widget
+
+    def register_notifiable(self, widget, widget_name):
         if hasattr(widget, "notify"):
             if callable(widget.notify):
                 if widget_name not in self.name_to_instance:
@@ -100,24 +128,128 @@ class WidgetManager:
                     f"is not callable. Skipping."
                 )
 
-        if "children" in widget_dictionary:
-            child_counter = {}  # Reset counter for children
-            for child in widget_dictionary["children"]:
-                widget.add_widget(
-                    self.create_widget_tree(
-                        child,
-                        path + [f"{widget_name}{counter[widget_name]}"],
-                        child_counter,
-                    )
+    def update_widget_tree(self, widget, old_dictionary, new_dictionary, changed_providers=()):
+        """Prepare updating a widget tree to a new configuration.
+
+        Widgets whose configuration, children and providers are unchanged
+        are kept as they are, with their threads and rendered surfaces.
+        Containers whose own parameters are unchanged are kept too, and
+        only their changed children are rebuilt. Everything else is created
+        again from the new configuration.
+
+        The running tree isn't touched: new widgets are built on the side,
+        and only swapped in, and the widgets they replace stopped, by
+        WidgetTreeUpdate.apply(). Kept and new notifiable widgets are
+        registered in this manager, so it should be a fresh one that
+        replaces the manager of the running tree.
+
+        Args:
+            widget: Root of the tree, built by create_widget_tree()
+            old_dictionary: Configuration the tree was built from
+            new_dictionary: New configuration
+            changed_providers: Names of providers that were replaced;
+                widgets bound to them are always rebuilt
+
+        Returns:
+            WidgetTreeUpdate to apply, or to discard if it isn't used.
+
+        Raises:
+            Exception: Whatever creating a new widget raised; the widgets
+                created until then are stopped again
+        """
+        update = WidgetTreeUpdate()
+        try:
+            update.root = self._update_widget(
+                widget, old_dictionary, new_dictionary, set(changed_providers), [], {}, update
+            )
+        except Exception:
+            update.discard()
+            raise
+        return update
+
+    def _update_widget(
+        self, widget, old_dictionary, new_dictionary, changed_providers, path, counter, update
+    ):
+        widget_name = new_dictionary.get("name") or new_dictionary["widget"]
+        number = counter.get(widget_name, 0) + 1
+        unique_name = "_".join(path + [f"{widget_name}{number}"])
+
+        reusable = unique_name == widget.unique_name and not self._uses_providers(
+            new_dictionary, changed_providers
+        )
+        if (
+            reusable
+            and old_dictionary == new_dictionary
+            and not self._uses_providers(new_dictionary, changed_providers, recursive=True)
+        ):
+            counter[widget_name] = number
+            self._register_tree(widget, new_dictionary)
+            return widget
+
+        old_children = old_dictionary.get("children", [])
+        new_children = new_dictionary.get("children", [])
+        if (
+            reusable
+            and isinstance(widget, ContainerWidget)
+            and self._parameters(old_dictionary) == self._parameters(new_dictionary)
+            # Flip containers look their children up by name and position
+            and [child.get("name") for child in old_children]
+            == [child.get("name") for child in new_children]
+        ):
+            counter[widget_name] = number
+            self.register_notifiable(widget, widget_name)
+            child_counter = {}
+            for index, (old_child, new_child) in enumerate(zip(old_children, new_children)):
+                child = widget.widget_list[index]
+                new_widget = self._update_widget(
+                    child,
+                    old_child,
+                    new_child,
+                    changed_providers,
+                    path + [f"{widget_name}{number}"],
+                    child_counter,
+                    update,
                 )
+                if new_widget is not child:
+                    update.replacements.append((widget, index, new_widget))
+            return widget
 
-        return widget
+        logging.debug(f"Rebuilding widget tree: {unique_name}")
+        new_widget = self.create_widget_tree(new_dictionary, path, counter, update.created)
+        update.removed.append(widget)
+        return new_widget
+
+    def _parameters(self, widget_dictionary):
+        return {key: value for key, value in widget_dictionary.items() if key != "children"}
+
+    def _uses_providers(self, widget_dictionary, provider_names, recursive=False):
+        """Check whether a widget, or with recursive any widget below it, uses any of the providers."""
+        providers = widget_dictionary.get("providers") or []
+        if not isinstance(providers, list):
+            providers = [providers]
+        if any(name in provider_names for name in providers):
+            return True
+        return recursive and any(
+            self._uses_providers(child, provider_names, recursive=True)
+            for child in widget_dictionary.get("children", [])
+        )
+
+    def _register_tree(self, widget, widget_dictionary):
+        """Register the notifiable widgets of a kept subtree again."""
+        self.register_notifiable(
+            widget, widget_dictionary.get("name") or widget_dictionary["widget"]
+        )
+        if isinstance(widget, ContainerWidget):
+            for child, child_dictionary in zip(
+                widget.widget_list, widget_dictionary.get("children", [])
+            ):
+                self._register_tree(child, child_dictionary)
 
     def recursively_stop_widgets(self, main_widget):
         if isinstance(main_widget, ContainerWidget):
             for widget in main_widget.widget_list:
                 logging.debug(f"Going deeper in {main_widget}")
-                self.stop_all_widgets(widget)
+                self.recursively_stop_widgets(widget)
         if isinstance(main_widget, UpdaterWidget):
             logging.debug(f"Stopping UpdaterWidget {main_widget}")
             main_widget.stop()
@@ -127,3 +259,43 @@ class WidgetManager:
     def stop_all_widgets(self, main_widget):
         self.recursively_stop_widgets(main_widget)
         self.name_to_instance = {}
+
+
+class WidgetTreeUpdate:
+    """Changes to a running widget tree, prepared by WidgetManager.update_widget_tree()."""
+
+    def __init__(self):
+        # Root of the updated tree
+        self.root = None
+        # (container, index, widget): children of kept containers to replace
+        self.replacements = []
+        # New widgets, not attached to the profiler yet
+        self.created = []
+        # Roots of the subtrees that are replaced
+        self.removed = []
+
+    def apply(self):
+        """Swap the new widgets into the tree, then stop the ones they replace."""
+        for widget in self.removed:
+            for old_widget in self._subtree(widget):
+                profiler.detach(old_widget)
+        for widget in self.created:
+            profiler.attach(widget)
+        for container, index, widget in self.replacements:
+            container.replace_widget(index, widget)
+        for widget in self.removed:
+            for old_widget in self._subtree(widget):
+                if isinstance(old_widget, UpdaterWidget):
+                    old_widget.stop()
+
+    def discard(self):
+        """Stop the new widgets, leaving the running tree as it was."""
+        for widget in self.created:
+            if isinstance(widget, UpdaterWidget):
+                widget.stop()
+
+    def _subtree(self, widget):
+        yield widget
+        if isinstance(widget, ContainerWidget):
+            for child in widget.widget_list:
+                yield from self._subtree(child)
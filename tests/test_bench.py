@@ -0,0 +1,76 @@
+"""Tests for the offline render benchmark."""
+
+import os
+import socket
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+import pytest
+import yaml
+
+from grydgets.bench import Bench
+from grydgets.widgets.base import Widget
+
+UNREACHABLE = "http://192.0.2.1"
+
+WIDGETS = {
+    "widgets": [
+        {
+            "widget": "grid",
+            "rows": 1,
+            "columns": 3,
+            "children": [
+                {"widget": "providerimage", "providers": ["camera"], "data_path": "url"},
+                {
+                    "widget": "providertemplate",
+                    "providers": ["camera"],
+                    "template": "{{ provider_camera.url }}",
+                    "hass_url": UNREACHABLE,
+                    "hass_token": "token",
+                },
+                {"widget": "rest", "url": f"{UNREACHABLE}/value"},
+            ],
+        }
+    ]
+}
+
+PROVIDERS = {"providers": {"camera": {"type": "rest", "url": f"{UNREACHABLE}/camera"}}}
+
+PAYLOADS = {
+    "camera": [{"url": f"{UNREACHABLE}/{index}.png"} for index in range(3)],
+}
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Record every outgoing connection, and refuse it."""
+    attempts = []
+
+    def connect(sock, address):
+        attempts.append(address)
+        raise OSError("network access in the bench")
+
+    monkeypatch.setattr(socket.socket, "connect", connect)
+    monkeypatch.setattr(socket.socket, "connect_ex", connect)
+    return attempts
+
+
+@pytest.mark.parametrize("scenario", ["idle", "value"])
+def test_bench_makes_no_requests(tmp_path, connections, scenario):
+    providers_path = tmp_path / "providers.yaml"
+    providers_path.write_text(yaml.safe_dump(PROVIDERS))
+    pygame.init()
+
+    bench = Bench(
+        WIDGETS, str(providers_path), PAYLOADS, (480, 320), value_provider="camera"
+    )
+    result = bench.run(scenario, frames=10, allocation_frames=2)
+
+    assert connections == []
+    assert sorted(result["offline_widgets"]) == [
+        "grid1_providerimage1",
+        "grid1_providertemplate1",
+        "grid1_rest1",
+    ]
+    assert not Widget.offline
@@ -0,0 +1,79 @@
+"""Tests for the MQTT provider."""
+
+import time
+import types
+
+import paho.mqtt.client as mqtt
+
+from grydgets.providers.mqtt import MQTTDataProvider
+
+
+class FakeClient:
+    """Stands in for a paho client, playing back a scripted session.
+
+    Each step of the script is run by one call of loop(), and returns its
+    result; once the script is done, loop() idles.
+    """
+
+    def __init__(self, provider, script):
+        self.provider = provider
+        self.script = list(script)
+
+    def connect(self, host, port, keepalive):
+        pass
+
+    def subscribe(self, topics):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def loop(self, timeout):
+        if not self.script:
+            time.sleep(timeout)
+            return mqtt.MQTT_ERR_SUCCESS
+        return self.script.pop(0)(self)
+
+    def connected(self):
+        self.provider._on_connect(self, None, {}, 0)
+        return mqtt.MQTT_ERR_SUCCESS
+
+    def message(self, topic, payload):
+        message = types.SimpleNamespace(topic=topic, payload=payload)
+        self.provider._on_message(self, None, message)
+        return mqtt.MQTT_ERR_SUCCESS
+
+    def connection_lost(self):
+        return mqtt.MQTT_ERR_CONN_LOST
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_disconnect_keeps_data(monkeypatch):
+    provider = MQTTDataProvider(
+        host="broker", topics="home/#", coalesce=0, update_interval=0.1, name="home"
+    )
+    first = FakeClient(provider, [
+        FakeClient.connected,
+        lambda client: client.message("home/power", b"250"),
+        FakeClient.connection_lost,
+    ])
+    # The non-retained topic isn't sent again after reconnecting
+    second = FakeClient(provider, [FakeClient.connected])
+    clients = [first, second]
+    monkeypatch.setattr(provider, "_make_client", lambda: clients.pop(0))
+
+    provider.start()
+    try:
+        assert wait_for(lambda: not second.script)
+        assert provider.get_data() == {"home/power": 250}
+        assert provider.get_error() is None
+    finally:
+        provider.stop()
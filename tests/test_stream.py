@@ -0,0 +1,106 @@
+"""Tests for the push-based stream providers."""
+
+import gzip
+import http.server
+import threading
+import time
+
+import pytest
+
+from grydgets.providers.stream import SSEDataProvider
+
+
+class EventStreamHandler(http.server.BaseHTTPRequestHandler):
+    """Sends one event on the first connection, then goes quiet."""
+
+    connections = 0
+
+    def do_GET(self):
+        type(self).connections += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        if self.connections == 1:
+            self.wfile.write(b'data: {"value": 1}\n\n')
+            self.wfile.flush()
+        # Hold the connection open without sending anything
+        time.sleep(2)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CompressingEventStreamHandler(http.server.BaseHTTPRequestHandler):
+    """Sends one event, compressed if the client accepts it, then closes."""
+
+    def do_GET(self):
+        body = b'data: {"value": 2}\n\n'
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(handler):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/events"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def event_server():
+    EventStreamHandler.connections = 0
+    yield from serve(EventStreamHandler)
+
+
+@pytest.fixture
+def compressing_event_server():
+    yield from serve(CompressingEventStreamHandler)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_idle_timeout_keeps_data(event_server):
+    provider = SSEDataProvider(
+        url=event_server, idle_timeout=0.3, update_interval=0.1, name="events"
+    )
+    provider.start()
+    try:
+        assert wait_for(lambda: provider.get_data() == {"value": 1})
+        # The quiet stream times out and is reopened, keeping the last event
+        assert wait_for(lambda: EventStreamHandler.connections >= 2)
+        assert provider.get_data() == {"value": 1}
+        assert provider.get_error() is None
+        assert provider.failures == 0
+    finally:
+        provider.stop()
+
+
+def test_events_are_not_compressed(compressing_event_server):
+    provider = SSEDataProvider(
+        url=compressing_event_server, update_interval=0.1, name="events"
+    )
+    provider.start()
+    try:
+        assert wait_for(lambda: provider.get_data() is not None)
+        assert provider.get_data() == {"value": 2}
+    finally:
+        provider.stop()